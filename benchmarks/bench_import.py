@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the package and the CLI's quick commands.
+
+Each case runs in a fresh interpreter, so the times include everything a
+cron job or display hook pays on every call. It also checks that commands
+which render nothing (--help, --list-decks, importing the package) do not
+load Pillow, NumPy or multiprocessing.
+
+To run this script:
+uv run benchmarks/bench_import.py
+uv run benchmarks/bench_import.py --repeat 20 --output imports.json
+uv run benchmarks/bench_import.py --baseline imports.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Modules that only rendering should load
+HEAVY_MODULES = ["PIL", "numpy", "concurrent.futures.process", "http.server"]
+
+# A result slower than baseline * (1 + threshold) counts as a regression
+DEFAULT_THRESHOLD = 0.30
+
+def _run_main(*argv):
+    return (f"import runpy, sys; sys.argv = ['main.py', {', '.join(repr(arg) for arg in argv)}]; "
+            f"runpy.run_path('main.py', run_name='__main__')")
+
+CASES = {
+    "python (startup only)": "pass",
+    "import hiragana_wallpaper": "sys.path.insert(0, 'src'); import hiragana_wallpaper",
+    "import hiragana_wallpaper.cli": "sys.path.insert(0, 'src'); import hiragana_wallpaper.cli",
+    "main.py --help": _run_main("--help"),
+    "main.py --list-decks": _run_main("--list-decks"),
+}
+
+# Report the heavy modules that were loaded, on stderr, when the interpreter exits
+_CHECK = ("import atexit, sys; atexit.register(lambda: print('LOADED=' + ','.join(m for m in "
+          f"{HEAVY_MODULES!r} if m in sys.modules), file=sys.stderr))")
+
+def run_case(code):
+    """Run code in a new interpreter; returns (seconds, heavy modules loaded)."""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", f"{_CHECK}; {code}"], cwd=ROOT,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    seconds = time.perf_counter() - start
+    loaded = []
+    for line in result.stderr.splitlines():
+        if line.startswith("LOADED="):
+            loaded = [name for name in line[len("LOADED="):].split(",") if name]
+    return seconds, loaded
+
+def run(repeat):
+    results = {}
+    for name, code in CASES.items():
+        times = []
+        for _ in range(repeat):
+            seconds, loaded = run_case(code)
+            times.append(seconds)
+        results[name] = {"min": min(times), "median": statistics.median(times), "runs": repeat,
+                         "loaded": loaded}
+    return results
+
+def compare(results, baseline, threshold):
+    """Return (name, baseline, current, ratio) for each case slower than the baseline allows."""
+    regressions = []
+    for name, timing in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        ratio = timing["min"] / previous["min"]
+        if ratio > 1 + threshold:
+            regressions.append((name, previous["min"], timing["min"], ratio))
+    return regressions
+
+def print_table(results, baseline=None):
+    width = max(len(name) for name in results)
+    print(f"{'case':<{width}}  {'min ms':>8}  {'median ms':>9}  {'vs base':>7}  heavy modules loaded")
+    for name, timing in results.items():
+        change = ""
+        if baseline and name in baseline:
+            change = f"{timing['min'] / baseline[name]['min']:.2f}x"
+        print(f"{name:<{width}}  {timing['min'] * 1000:>8.1f}  {timing['median'] * 1000:>9.1f}  "
+              f"{change:>7}  {', '.join(timing['loaded']) or '-'}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark package import and CLI startup.")
+    parser.add_argument("--repeat", type=int, default=10, help="runs per case (default: 10)")
+    parser.add_argument("--output", metavar="FILE", help="write results as JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="compare against saved results")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before failing (default: 0.30 = 30%%)")
+    args = parser.parse_args(argv)
+    if args.baseline and not os.path.isfile(args.baseline):
+        parser.error(f"baseline file not found: {args.baseline}")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = run(args.repeat)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    print_table(results, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2)
+        print(f"📄 Results written to {args.output}")
+
+    status = 0
+    for name, timing in results.items():
+        if timing["loaded"]:
+            print(f"❌ {name} loaded {', '.join(timing['loaded'])}")
+            status = 1
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for name, before, after, ratio in regressions:
+            print(f"❌ {name}: {before * 1000:.1f} ms -> {after * 1000:.1f} ms ({ratio:.2f}x)")
+        if regressions:
+            status = 1
+        else:
+            print("✅ No regressions against the baseline")
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
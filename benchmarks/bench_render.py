@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the render and encode hot paths.
+
+Times font loading, the reference chart, a single wallpaper (in full and as a
+dirty-region update), image encoding and the full CLI batch, at several
+resolutions and job counts. Results can be written as JSON and compared
+against a saved baseline.
+
+To run this script:
+uv run benchmarks/bench_render.py
+uv run benchmarks/bench_render.py --sizes 1080p,retina --jobs 1,4 --output results.json
+uv run benchmarks/bench_render.py --baseline benchmarks/baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from PIL import Image, ImageDraw
+from hiragana_wallpaper import HIRAGANA_DATA, COLORS, generate_wallpaper
+from hiragana_wallpaper import cli
+from hiragana_wallpaper.diffrender import DiffRenderer
+from hiragana_wallpaper.encoders import PRESETS, available_formats, encode_image
+from hiragana_wallpaper.fonts import clear_font_cache
+from hiragana_wallpaper.generator import (
+    get_system_fonts, get_chart_fonts, draw_reference_chart, clear_render_cache, _chart_geometry
+)
+from hiragana_wallpaper.layout import parse_size, format_size, get_layout
+
+# A result slower than baseline * (1 + threshold) counts as a regression
+DEFAULT_THRESHOLD = 0.20
+
+def measure(func, repeat, setup=None):
+    """Run func repeat times; returns timing statistics in seconds."""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {"min": min(times), "median": statistics.median(times), "runs": repeat}
+
+def cold_caches():
+    clear_font_cache()
+    clear_render_cache()
+
+def bench_size(size, repeat, formats):
+    """Benchmark the per-image stages at one size."""
+    results = {}
+    entry = HIRAGANA_DATA[5]
+
+    results["get_system_fonts (cold)"] = measure(lambda: get_system_fonts(size), repeat, setup=cold_caches)
+    results["get_system_fonts (warm)"] = measure(lambda: get_system_fonts(size), repeat)
+
+    def chart():
+        img = Image.new("RGB", size, COLORS["background"])
+        font_jp, font_en = get_chart_fonts(size)
+        draw_reference_chart(ImageDraw.Draw(img), *_chart_geometry(*size), font_jp, font_en,
+                             layout=get_layout(*size))
+    results["draw_reference_chart"] = measure(chart, repeat)
+
+    results["generate_wallpaper (cold)"] = measure(lambda: generate_wallpaper(entry, size=size),
+                                                   repeat, setup=cold_caches)
+    generate_wallpaper(entry, size=size)
+    results["generate_wallpaper (warm)"] = measure(lambda: generate_wallpaper(entry, size=size), repeat)
+
+    # Alternating characters, so each render redraws the previous one's regions
+    renderer = DiffRenderer(size)
+    renderer.render(HIRAGANA_DATA[4])
+    entries = iter(HIRAGANA_DATA[4:6] * repeat)
+    results["DiffRenderer.render (warm)"] = measure(lambda: renderer.render(next(entries)), repeat)
+
+    wallpaper = generate_wallpaper(entry, size=size)
+    for fmt in formats:
+        for preset in PRESETS:
+            results[f"encode {fmt}/{preset}"] = measure(lambda: encode_image(wallpaper, fmt, preset), repeat)
+
+    return results
+
+def bench_batch(size, jobs, repeat):
+    """Benchmark a full, forced CLI run in a scratch directory."""
+    argv = ["--force", "--jobs", str(jobs), "--sizes", format_size(size)]
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                return measure(lambda: cli.main(argv), repeat, setup=cold_caches)
+        finally:
+            os.chdir(cwd)
+
+def run(args):
+    formats = [fmt for fmt in args.formats.split(",") if fmt in available_formats()]
+    results = {}
+    for size in args.sizes:
+        label = format_size(size)
+        print(f"⏱️  {label}...", file=sys.stderr)
+        for name, timing in bench_size(size, args.repeat, formats).items():
+            results[f"{label} {name}"] = timing
+        if not args.skip_batch:
+            for jobs in args.jobs:
+                timing = bench_batch(size, jobs, args.batch_repeat)
+                results[f"{label} cli.main batch (jobs={jobs})"] = timing
+    return results
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "deck_size": len(HIRAGANA_DATA),
+    }
+
+def compare(results, baseline, threshold):
+    """Return (name, baseline, current, ratio) for each result slower than the baseline allows."""
+    regressions = []
+    for name, timing in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        ratio = timing["min"] / previous["min"]
+        if ratio > 1 + threshold:
+            regressions.append((name, previous["min"], timing["min"], ratio))
+    return regressions
+
+def print_table(results, baseline=None):
+    width = max(len(name) for name in results)
+    print(f"{'benchmark':<{width}}  {'min ms':>10}  {'median ms':>10}  {'vs base':>8}")
+    for name, timing in results.items():
+        change = ""
+        if baseline and name in baseline:
+            change = f"{timing['min'] / baseline[name]['min']:.2f}x"
+        print(f"{name:<{width}}  {timing['min'] * 1000:>10.1f}  {timing['median'] * 1000:>10.1f}  {change:>8}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark wallpaper rendering and encoding.")
+    parser.add_argument("--sizes", default="retina",
+                        help="comma-separated sizes or presets (default: retina)")
+    parser.add_argument("--jobs", default="1",
+                        help="comma-separated job counts for the CLI batch (default: 1)")
+    parser.add_argument("--formats", default="png,png8",
+                        help="comma-separated formats to encode (default: png,png8)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per stage (default: 5)")
+    parser.add_argument("--batch-repeat", type=int, default=1, help="runs per CLI batch (default: 1)")
+    parser.add_argument("--skip-batch", action="store_true", help="skip the full CLI batch")
+    parser.add_argument("--output", metavar="FILE", help="write results as JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="compare against saved results")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before failing (default: 0.20 = 20%%)")
+    args = parser.parse_args(argv)
+    if args.baseline and not os.path.isfile(args.baseline):
+        parser.error(f"baseline file not found: {args.baseline}")
+    args.sizes = [parse_size(text) for text in args.sizes.split(",")]
+    args.jobs = [int(text) for text in args.jobs.split(",")]
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = run(args)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    print_table(results, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2)
+        print(f"📄 Results written to {args.output}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for name, before, after, ratio in regressions:
+            print(f"❌ {name}: {before * 1000:.1f} ms -> {after * 1000:.1f} ms ({ratio:.2f}x)")
+        if regressions:
+            return 1
+        print("✅ No regressions against the baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
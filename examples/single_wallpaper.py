@@ -13,6 +13,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from hiragana_wallpaper import generate_wallpaper, create_output_directory, HIRAGANA_DATA
+from hiragana_wallpaper.encoders import save_image
 
 def test_single_character():
     """Generate just one wallpaper for testing."""
@@ -34,9 +35,9 @@ def test_single_character():
     
     # Save it
     test_filename = f"test_output/test_hiragana_{pronunciation}_{char}.png"
-    wallpaper.save(test_filename, "PNG", quality=95)
+    result = save_image(wallpaper, test_filename, "png")
     
-    print(f"✅ Test wallpaper saved as: {test_filename}")
+    print(f"✅ Test wallpaper saved as: {test_filename} ({result.bytes:,} bytes)")
     print("📱 Open this file to see how the layout looks!")
     print("🔧 If you like the result, run the full script: uv run main.py")
 
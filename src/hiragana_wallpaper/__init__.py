@@ -8,7 +8,29 @@ for each Hiragana character to help with Japanese language learning.
 __version__ = "0.1.0"
 __author__ = "Your Name"
 
-from .data import HIRAGANA_DATA, COLORS
-from .generator import generate_wallpaper, create_output_directory
+import importlib
 
-__all__ = ["HIRAGANA_DATA", "COLORS", "generate_wallpaper", "create_output_directory"]
+# Public names and the modules they live in. They are imported on first
+# access, so `import hiragana_wallpaper` does not load Pillow or the decks.
+_LAZY_ATTRIBUTES = {
+    "HIRAGANA_DATA": ".data",
+    "COLORS": ".data",
+    "load_deck": ".deck",
+    "generate_wallpaper": ".generator",
+    "create_output_directory": ".generator",
+    "iter_wallpapers": ".pipeline",
+    "generate_all": ".pipeline",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
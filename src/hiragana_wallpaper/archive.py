@@ -0,0 +1,192 @@
+"""
+Single-file archives of a whole wallpaper deck.
+
+Instead of one file per wallpaper, a deck can be written into one container:
+
+- a ZIP file (.zip) with stored, uncompressed entries: the images are
+  already compressed, and stored entries can be read straight from the file;
+- a pack file (.hwpack): the encoded images back to back, followed by a JSON
+  index of {name: [offset, length]} and the index length:
+
+      b"HWPACK1\\n" | image | image | ... | JSON index | 8-byte little-endian index length
+
+ArchiveReader memory-maps either kind and returns one wallpaper without
+reading or decompressing the others.
+"""
+
+import io
+import json
+import mmap
+import os
+import struct
+import zipfile
+from .deck import DEFAULT_DECK, get_deck
+from .encoders import EncodeResult
+from .layout import BASE_SIZE
+from .pipeline import RenderTask, render_tasks, default_filename, task_label
+from . import profiling
+
+PACK_MAGIC = b"HWPACK1\n"
+PACK_EXTENSION = ".hwpack"
+
+# Archive kinds by file extension
+ARCHIVE_FORMATS = {".zip": "zip", PACK_EXTENSION: "pack"}
+
+_FOOTER = struct.Struct("<Q")
+
+# Fixed part of a ZIP local file header; the name and extra field lengths are at 26 and 28
+_ZIP_LOCAL_HEADER = struct.Struct("<4s22xHH")
+
+def archive_format(path):
+    """Return "zip" or "pack" for an archive path, by extension."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unknown archive type '{extension}' (expected .zip or {PACK_EXTENSION})")
+    return ARCHIVE_FORMATS[extension]
+
+class ArchiveWriter:
+    """Write named files into a .zip or .hwpack archive.
+
+    The archive is written to a temporary file and moved into place on
+    close(), so readers never see a partial archive.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.format = archive_format(path)
+        self._tmp_path = path + ".tmp"
+        self._index = {}
+        if self.format == "zip":
+            self._zip = zipfile.ZipFile(self._tmp_path, "w", zipfile.ZIP_STORED)
+        else:
+            self._file = open(self._tmp_path, "wb")
+            self._file.write(PACK_MAGIC)
+
+    def add(self, name, data):
+        """Append one file's bytes under name."""
+        if name in self._index:
+            raise ValueError(f"Duplicate archive entry '{name}'")
+        if self.format == "zip":
+            self._zip.writestr(name, data)
+            self._index[name] = len(data)
+        else:
+            self._index[name] = [self._file.tell(), len(data)]
+            self._file.write(data)
+
+    def close(self):
+        """Finish the archive and move it into place."""
+        if self.format == "zip":
+            self._zip.close()
+        else:
+            index = json.dumps(self._index, ensure_ascii=False).encode("utf-8")
+            self._file.write(index)
+            self._file.write(_FOOTER.pack(len(index)))
+            self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self):
+        """Discard the partial archive."""
+        if self.format == "zip":
+            self._zip.close()
+        else:
+            self._file.close()
+        os.remove(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+class ArchiveReader:
+    """Memory-mapped reader for archives written by ArchiveWriter."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(PACK_MAGIC)] == PACK_MAGIC:
+            self._index = self._read_pack_index()
+        else:
+            self._index = self._read_zip_index()
+
+    def _read_pack_index(self):
+        (length,) = _FOOTER.unpack_from(self._map, len(self._map) - _FOOTER.size)
+        start = len(self._map) - _FOOTER.size - length
+        return {name: tuple(span) for name, span in json.loads(self._map[start:start + length]).items()}
+
+    def _read_zip_index(self):
+        index = {}
+        with zipfile.ZipFile(self._file) as archive:
+            for info in archive.infolist():
+                if info.compress_type != zipfile.ZIP_STORED:
+                    raise ValueError(f"'{info.filename}' is compressed; only stored entries can be mapped")
+                _, name_length, extra_length = _ZIP_LOCAL_HEADER.unpack_from(self._map, info.header_offset)
+                offset = info.header_offset + _ZIP_LOCAL_HEADER.size + name_length + extra_length
+                index[info.filename] = (offset, info.file_size)
+        return index
+
+    def names(self):
+        """Return the names of the files in the archive, in the order they were written."""
+        return list(self._index)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def read(self, name):
+        """Return one file's bytes."""
+        offset, length = self._index[name]
+        return self._map[offset:offset + length]
+
+    def open_image(self, name):
+        """Decode one file as a PIL image."""
+        from PIL import Image
+        return Image.open(io.BytesIO(self.read(name)))
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def export_archive(path, entries=None, size=BASE_SIZE, fmt="png", preset="default",
+                   highlight=False, jobs=1, lookahead=None, filename=None, theme="plain", deck=DEFAULT_DECK,
+                   sizes=None, on_result=None, glyph_cache=None, worker_caches=None):
+    """Render entries into one archive at path (.zip or .hwpack), like generate_all.
+
+    sizes renders every entry at each of several sizes instead of at size.
+    filename(entry, size, fmt) names each wallpaper in the archive (default:
+    the deck's file name), and on_result(result, done, total) is called
+    after each one is written. glyph_cache and worker_caches are passed to
+    render_tasks. Returns an EncodeResult (archive entry name,
+    bytes, encode seconds) per wallpaper.
+    """
+    if entries is None:
+        entries = get_deck(deck).entries
+    if sizes is None:
+        sizes = [size]
+    if filename is None:
+        filename = lambda entry, size, fmt: default_filename(entry, fmt, deck)
+
+    tasks = [RenderTask(entry, tuple(size), fmt, preset, highlight, theme, deck)
+             for entry in entries for size in sizes]
+    results = []
+    with ArchiveWriter(path) as writer:
+        for task, data, seconds in render_tasks(tasks, jobs, lookahead, glyph_cache, worker_caches):
+            name = filename(task.entry, task.size, fmt)
+            with profiling.image(task_label(task)), profiling.stage("write", bytes=len(data)):
+                writer.add(name, data)
+            results.append(EncodeResult(name, len(data), seconds))
+            if on_result is not None:
+                on_result(results[-1], len(results), len(tasks))
+    return results
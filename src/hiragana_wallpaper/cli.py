@@ -2,56 +2,433 @@
 Command-line interface for the Hiragana Wallpaper Generator.
 """
 
+import argparse
 import os
-from . import HIRAGANA_DATA, generate_wallpaper, create_output_directory
+from .deck import DEFAULT_DECK, available_decks, get_deck, load_deck
+from .generator import create_output_directory, warm_caches
+from .glyphs import load_glyph_cache, save_glyph_cache
+from .encoders import FORMATS, PRESETS, format_available
+from .layout import BASE_SIZE, parse_size, format_size
+from .manifest import render_key, plan_build, prune_files, save_manifest
+from .pipeline import (RenderTask, render_tasks, render_task, default_filename, write_file, task_label,
+                       cache_counts)
+from .themes import available_themes, theme_key
+from . import profiling
 
 # Configuration
-IMAGES_DIR = "hiragana_wallpapers"
+IMAGES_DIR = "hiragana_wallpapers"  # other decks use <deck name>_wallpapers
 IMAGES_PER_MINUTE = 3  # How often to change wallpapers (roughly)
 
-def main():
+def _parse_sizes(text):
+    """Parse a comma-separated list of sizes for --sizes."""
+    try:
+        sizes = [parse_size(part) for part in text.split(",") if part.strip()]
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    if not sizes:
+        raise argparse.ArgumentTypeError("no sizes given")
+    # Keep the first occurrence of each size
+    return list(dict.fromkeys(sizes))
+
+def parse_args(argv=None):
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Generate Hiragana wallpapers.")
+    parser.add_argument("--deck", default=DEFAULT_DECK,
+                        help=f"deck to generate: a built-in deck ({', '.join(available_decks())}) "
+                             f"or a deck JSON file (default: {DEFAULT_DECK})")
+    parser.add_argument("--list-decks", action="store_true",
+                        help="list the built-in decks and exit")
+    parser.add_argument("-j", "--jobs", type=int,
+                        help="number of worker processes (0 = one per CPU; default: 1, "
+                             "or one per CPU with --serve)")
+    parser.add_argument("--highlight", action="store_true",
+                        help="highlight each character's cell in the reference chart")
+    parser.add_argument("--sizes", type=_parse_sizes,
+                        help="comma-separated output sizes, WIDTHxHEIGHT or presets "
+                             "(retina, 1080p, 1440p, 4k, 5k, portrait); default: 2880x1800, "
+                             "or 2880x1800 and the presets with --serve, which serves no other sizes")
+    parser.add_argument("--format", dest="fmt", choices=list(FORMATS), default="png",
+                        help="output format (png8 = 8-bit PNG, much smaller; images with more than "
+                             "256 colours stay RGB so it is always lossless; default: png)")
+    parser.add_argument("--preset", choices=PRESETS, default="default",
+                        help="encoder preset: fast encode or small files (default: Pillow defaults)")
+    parser.add_argument("--theme", choices=available_themes(), default="plain",
+                        help="colour theme; gradients, vignette, noise and chart accents need NumPy "
+                             "(default: plain)")
+    parser.add_argument("--report", action="store_true",
+                        help="print the size and encode time of every file")
+    parser.add_argument("--archive", metavar="FILE",
+                        help="write the whole deck into one file instead of a folder: "
+                             "FILE.zip (stored entries) or FILE.hwpack (packed, with a JSON index)")
+    parser.add_argument("--glyph-cache", metavar="FILE",
+                        help="load rasterized glyphs from FILE and save them back after the run")
+    parser.add_argument("--profile", action="store_true",
+                        help="time each stage (fonts, background, hero, encode, write) and print a summary")
+    parser.add_argument("--profile-json", metavar="FILE",
+                        help="write per-stage and per-image timings as JSON (implies --profile)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="write stage timings in Chrome trace format (implies --profile)")
+    parser.add_argument("--profile-char", metavar="ROMAJI",
+                        help="run cProfile on one character and save the stats to profile-ROMAJI.prof")
+    parser.add_argument("--serve", action="store_true",
+                        help="run an HTTP server rendering /wallpaper/<romaji>?w=&h=&fmt= on demand")
+    parser.add_argument("--host", default="127.0.0.1", help="address for --serve (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="port for --serve (default: 8000)")
+    parser.add_argument("--cache-mb", type=int, default=256,
+                        help="memory for cached images in --serve mode (default: 256)")
+    parser.add_argument("--rotate", action="store_true",
+                        help="keep running and switch the wallpaper every --interval minutes, "
+                             "rendering the next ones ahead of time")
+    parser.add_argument("--order", choices=["sequential", "random", "spaced"], default="sequential",
+                        help="order for --rotate; spaced repeats new kana soon and familiar ones "
+                             "rarely (default: sequential)")
+    parser.add_argument("--interval", type=float, default=IMAGES_PER_MINUTE,
+                        help=f"minutes between wallpapers for --rotate (default: {IMAGES_PER_MINUTE})")
+    parser.add_argument("--ahead", type=int, default=3,
+                        help="wallpapers to render ahead for --rotate (default: 3)")
+    parser.add_argument("--setter", choices=["symlink", "file", "command"], default="symlink",
+                        help="how --rotate applies a wallpaper: swap a symlink or rename a file "
+                             "at --target, or run --set-command (default: symlink)")
+    parser.add_argument("--target", metavar="PATH",
+                        help="symlink or file for --rotate (default: current.<ext> in the "
+                             "output directory's .rotation folder)")
+    parser.add_argument("--set-command", metavar="CMD",
+                        help="command for --setter command; {path} is replaced by the wallpaper, "
+                             "e.g. \"feh --bg-fill {path}\"")
+    parser.add_argument("--force", action="store_true",
+                        help="re-render every wallpaper, even if it is up to date")
+    args = parser.parse_args(argv)
+    if args.jobs is not None and args.jobs < 0:
+        parser.error("--jobs must be 0 (one per CPU) or more")
+    # --serve picks its own default sizes
+    if args.sizes is None and not args.serve:
+        args.sizes = [BASE_SIZE]
+    if not format_available(args.fmt):
+        parser.error(f"the installed Pillow cannot write {args.fmt}")
+    try:
+        load_deck(args.deck)
+    except (OSError, ValueError, KeyError) as e:
+        parser.error(f"cannot load deck {args.deck}: {e}")
+    if args.rotate:
+        if args.interval <= 0 or args.ahead < 1:
+            parser.error("--interval must be positive and --ahead at least 1")
+        if args.setter == "command" and not args.set_command:
+            parser.error("--setter command needs --set-command")
+    if args.archive:
+        from .archive import archive_format
+        try:
+            archive_format(args.archive)
+        except ValueError as e:
+            parser.error(str(e))
+    return args
+
+def output_directory(deck):
+    """Folder a deck's wallpapers are written to."""
+    if deck.name == DEFAULT_DECK:
+        return IMAGES_DIR
+    return f"{deck.name}_wallpapers"
+
+def output_filename(character_data, size, sizes, fmt="png", deck=DEFAULT_DECK):
+    """Path of a wallpaper relative to the output directory.
+
+    A single size is written straight into the output directory; several
+    sizes get one WIDTHxHEIGHT subdirectory each.
+    """
+    filename = default_filename(character_data, fmt, deck)
+    if len(sizes) == 1:
+        return filename
+    return os.path.join(format_size(size), filename)
+
+def profile_character(romaji, size, fmt, preset, highlight, theme="plain", deck=DEFAULT_DECK):
+    """Render one character under cProfile, print the top functions and save the stats."""
+    import cProfile
+    import pstats
+    
+    record = get_deck(deck).by_romaji(romaji)
+    if record is None:
+        print(f"⚠️  No character with pronunciation '{romaji}' to profile")
+        return
+    task = RenderTask(record.as_dict(), size, fmt, preset, highlight, theme, deck)
+    
+    profiler = cProfile.Profile()
+    profiler.runcall(render_task, task)
+    path = f"profile-{romaji}.prof"
+    profiler.dump_stats(path)
+    
+    print(f"🔬 cProfile for {record.char} ({romaji}), saved to {path}:")
+    pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+
+def load_glyphs(args):
+    """Load the --glyph-cache file, if any."""
+    if args.glyph_cache:
+        loaded = load_glyph_cache(args.glyph_cache)
+        print(f"🔣 Loaded {loaded} glyphs from {args.glyph_cache}")
+
+def share_glyphs(args, entries):
+    """Rasterize every glyph here and save the --glyph-cache file, so the workers load it at start-up."""
+    if args.glyph_cache:
+        for size in args.sizes:
+            warm_caches(entries, size, args.theme, args.deck)
+        save_glyph_cache(args.glyph_cache)
+
+def print_cache_counts(worker_caches):
+    """Print font and glyph cache hits and misses, summed over this process and its workers."""
+    counts = [cache_counts(), *worker_caches.values()]
+    where = f" (this process and {len(worker_caches)} workers)" if worker_caches else ""
+    for icon, name in (("🔤", "font"), ("🔣", "glyph")):
+        hits = sum(count[name]["hits"] for count in counts)
+        misses = sum(count[name]["misses"] for count in counts)
+        print(f"{icon} {name.capitalize()} cache: {hits} hits, {misses} misses{where}")
+
+def export_deck(args, jobs):
+    """Render every wallpaper into the --archive file.
+
+    Returns (count, bytes, encode seconds, worker cache counts).
+    """
+    from .archive import export_archive
+    
+    entries = get_deck(args.deck).entries
+    load_glyphs(args)
+    if jobs > 1:
+        share_glyphs(args, entries)
+    
+    def filename(character_data, size, fmt):
+        return output_filename(character_data, size, args.sizes, fmt, args.deck)
+    
+    def on_result(result, done, total):
+        if args.report:
+            print(f"{result.path}: {result.bytes:,} bytes, encoded in {result.seconds * 1000:.1f} ms")
+        if done % 10 == 0:
+            print(f"Progress: {done}/{total} completed")
+    
+    worker_caches = {}
+    results = export_archive(args.archive, entries, sizes=args.sizes, fmt=args.fmt, preset=args.preset,
+                             highlight=args.highlight, jobs=jobs, filename=filename, theme=args.theme,
+                             deck=args.deck, on_result=on_result, glyph_cache=args.glyph_cache,
+                             worker_caches=worker_caches)
+    if args.glyph_cache and jobs == 1:
+        save_glyph_cache(args.glyph_cache)
+    return (len(results), sum(result.bytes for result in results),
+            sum(result.seconds for result in results), worker_caches)
+
+def print_profile(recorder, args):
+    """Print the stage timing table and write the --profile-json and --trace files."""
+    if recorder is None or not recorder.events:
+        return
+    print()
+    print("⏱️  Time per stage:")
+    print(recorder.format_table())
+    if args.profile_json:
+        recorder.save_json(args.profile_json)
+        print(f"📄 Stage timings written to {args.profile_json}")
+    if args.trace:
+        recorder.save_trace(args.trace)
+        print(f"📄 Trace written to {args.trace}")
+
+def rotate_wallpapers(args, deck, images_dir):
+    """Run --rotate until interrupted."""
+    import signal
+    import sys
+    from .encoders import file_extension
+    from .rotate import SETTERS, rotate
+    
+    spool_dir = os.path.join(images_dir, ".rotation")
+    target = args.target or os.path.join(spool_dir, f"current.{file_extension(args.fmt)}")
+    if args.setter == "command":
+        setter = SETTERS["command"](args.set_command)
+    else:
+        setter = SETTERS[args.setter](target)
+    
+    print(f"🔁 Rotating {deck.name} wallpapers ({args.order}) every {args.interval:g} minute(s)")
+    if args.setter == "command":
+        print(f"🖼️  Setting each wallpaper with: {args.set_command}")
+    else:
+        print(f"🖼️  Current wallpaper: {os.path.abspath(target)}")
+    print("Press Ctrl+C to stop")
+    
+    # Stop cleanly (deleting the unshown wallpapers) when a service manager stops us too
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    
+    def report(entry):
+        print(f"Showing {entry['char']} ({entry['pronunciation']})")
+    
+    rotate(setter, spool_dir, args.interval * 60, order=args.order, size=args.sizes[0], fmt=args.fmt,
+           preset=args.preset, highlight=args.highlight, theme=args.theme, deck=args.deck,
+           ahead=args.ahead, on_switch=report)
+
+def list_decks():
+    """Print the built-in decks with their size and chart columns."""
+    for name in available_decks():
+        deck = load_deck(name)
+        print(f"{name:<12} {len(deck):>4} kana  columns: {' '.join(deck.columns)}")
+
+def main(argv=None):
     """Main function to generate all Hiragana wallpapers."""
-    print("🎌 Generating Hiragana wallpapers...")
-    print(f"📁 Output directory: {IMAGES_DIR}")
-    print(f"🎨 Theme: Dark minimalist (3 colors)")
-    print(f"📐 Resolution: 2880x1800 (Mac retina)")
+    args = parse_args(argv)
+    jobs = 1 if args.jobs is None else args.jobs or os.cpu_count()
+    
+    if args.list_decks:
+        list_decks()
+        return
+    
+    if args.serve:
+        # Imported here so normal runs don't pay for the HTTP stack
+        from .server import serve
+        # Concurrent requests should render concurrently, so the server uses every CPU by default
+        serve(args.host, args.port, jobs=args.jobs or os.cpu_count(), cache_bytes=args.cache_mb * 1024 * 1024,
+              deck=args.deck, sizes=args.sizes)
+        return
+    
+    deck = get_deck(args.deck)
+    images_dir = output_directory(deck)
+    
+    if args.rotate:
+        rotate_wallpapers(args, deck, images_dir)
+        return
+    
+    recorder = None
+    if args.profile or args.profile_json or args.trace:
+        recorder = profiling.StageRecorder()
+        profiling.add_hook(recorder)
+    
+    print(f"🎌 Generating {deck.name.capitalize()} wallpapers...")
+    if args.archive:
+        print(f"📦 Archive: {args.archive}")
+    else:
+        print(f"📁 Output directory: {images_dir}")
+    print(f"🎨 Theme: {args.theme}")
+    print(f"📐 Resolution: {', '.join(format_size(size) for size in args.sizes)}")
     print()
     
-    # Create output directory
-    create_output_directory(IMAGES_DIR)
+    if args.archive:
+        # One container for the whole deck, always rebuilt in full
+        try:
+            count, total_bytes, total_encode_seconds, worker_caches = export_deck(args, jobs)
+        finally:
+            if recorder is not None:
+                profiling.remove_hook(recorder)
+        print()
+        print(f"✅ Wrote {count} wallpapers to {os.path.abspath(args.archive)}")
+        print(f"💾 {args.fmt.upper()} ({args.preset}): {total_bytes:,} bytes, "
+              f"{total_encode_seconds:.2f}s encoding")
+        print_cache_counts(worker_caches)
+        print_profile(recorder, args)
+        if args.profile_char:
+            print()
+            profile_character(args.profile_char, args.sizes[0], args.fmt, args.preset, args.highlight,
+                              args.theme, args.deck)
+        return
+    
+    # Create output directory (and one subdirectory per size)
+    create_output_directory(images_dir)
+    if len(args.sizes) > 1:
+        for size in args.sizes:
+            os.makedirs(os.path.join(images_dir, format_size(size)), exist_ok=True)
+    
+    # Descriptive filename and content hash for each character and size, in deck order
+    wanted = {}
+    targets = []
+    chart = deck.chart_rows()
+    for character_data in deck.entries:
+        for size in args.sizes:
+            filename = output_filename(character_data, size, args.sizes, args.fmt, args.deck)
+            wanted[filename] = render_key(character_data, size=list(size), highlight=args.highlight,
+                                          format=args.fmt, preset=args.preset, theme=args.theme,
+                                          theme_settings=theme_key(args.theme), deck=deck.name, chart=chart)
+            targets.append((character_data, size, filename))
+    
+    # Only render what changed, and drop files for removed entries
+    to_render, to_prune = plan_build(images_dir, wanted, force=args.force)
+    # A set, so checking every file of a large deck stays linear
+    to_render = set(to_render)
+    prune_files(images_dir, to_prune)
+    if to_prune:
+        print(f"🧹 Removed {len(to_prune)} stale wallpapers")
+    
+    pending = [target for target in targets if target[2] in to_render]
+    skipped_count = len(wanted) - len(pending)
+    if skipped_count:
+        print(f"⏭️  Skipping {skipped_count} up-to-date wallpapers")
     
     # Track progress
-    total_chars = len(HIRAGANA_DATA)
+    total_chars = len(pending)
     generated_count = 0
     
-    # Generate wallpaper for each character
-    for character_data in HIRAGANA_DATA:
-        char = character_data["char"]
-        pronunciation = character_data["pronunciation"]
-        
-        print(f"Generating {char} ({pronunciation})...")
-        
-        # Generate the image
-        wallpaper = generate_wallpaper(character_data)
-        
-        # Save with descriptive filename
-        filename = f"hiragana_{character_data['pronunciation']}_{char}.png"
-        filepath = os.path.join(IMAGES_DIR, filename)
-        
-        wallpaper.save(filepath, "PNG", quality=95)
+    total_bytes = 0
+    total_encode_seconds = 0.0
+    
+    load_glyphs(args)
+    
+    # A single wallpaper is not worth starting workers for
+    in_process = jobs == 1 or total_chars <= 1
+    if not in_process:
+        # Rasterize everything once here so the workers can share it
+        share_glyphs(args, [character_data for character_data, _, _ in pending])
         
-        generated_count += 1
+        # Render and encode in worker processes; results come back in deck order
+        print(f"⚙️  Using {jobs} worker processes")
+    
+    tasks = [
+        RenderTask(character_data, size, args.fmt, args.preset, args.highlight, args.theme, args.deck)
+        for character_data, size, _ in pending
+    ]
+    worker_caches = {}
+    results = render_tasks(tasks, jobs=1 if in_process else jobs, glyph_cache=args.glyph_cache,
+                           worker_caches=worker_caches)
+    
+    try:
+        # Write each file as soon as it is ready
+        for (task, data, seconds), (_, _, filename) in zip(results, pending):
+            with profiling.image(task_label(task)), profiling.stage("write", bytes=len(data)):
+                write_file(os.path.join(images_dir, filename), data)
+            generated_count += 1
+            total_bytes += len(data)
+            total_encode_seconds += seconds
+            if args.report:
+                print(f"{filename}: {len(data):,} bytes, encoded in {seconds * 1000:.1f} ms")
+            elif jobs == 1:
+                print(f"Generated {task.entry['char']} ({task.entry['pronunciation']}) "
+                      f"at {format_size(task.size)}")
+            
+            # Show progress
+            if generated_count % 10 == 0:
+                print(f"Progress: {generated_count}/{total_chars} completed")
+    finally:
+        results.close()
+        if recorder is not None:
+            profiling.remove_hook(recorder)
         
-        # Show progress
-        if generated_count % 10 == 0:
-            print(f"Progress: {generated_count}/{total_chars} completed")
+        # Record what is on disk now, including a partial run
+        done = {filename for _, _, filename in pending[:generated_count]}
+        previous = {filename for filename in wanted if filename not in to_render}
+        save_manifest(images_dir, {
+            filename: key for filename, key in wanted.items()
+            if filename in done or filename in previous
+        })
     
     print()
     print(f"✅ Generation complete!")
     print(f"📊 Generated {generated_count} wallpapers")
-    print(f"📂 Saved in: {os.path.abspath(IMAGES_DIR)}")
+    if generated_count:
+        print(f"💾 {args.fmt.upper()} ({args.preset}): {total_bytes:,} bytes, "
+              f"{total_encode_seconds:.2f}s encoding "
+              f"({total_encode_seconds * 1000 / generated_count:.1f} ms per file)")
+    print(f"📂 Saved in: {os.path.abspath(images_dir)}")
+    if generated_count:
+        print_cache_counts(worker_caches)
+        # Workers loaded the glyphs saved before rendering; a run in this process saves its own
+        if args.glyph_cache and in_process:
+            save_glyph_cache(args.glyph_cache)
+    
+    print_profile(recorder, args)
+    if args.profile_char:
+        print()
+        profile_character(args.profile_char, args.sizes[0], args.fmt, args.preset, args.highlight,
+                          args.theme, args.deck)
+    
     print()
     print("🎯 Usage tips:")
     print(f"• Set macOS to rotate wallpapers every {IMAGES_PER_MINUTE} minute(s)")
-    print(f"• Select the '{IMAGES_DIR}' folder as wallpaper source")
+    print(f"• Select the '{images_dir}' folder as wallpaper source")
     print(f"• Enable 'Change wallpaper' in System Preferences > Desktop & Screen Saver")
+    print(f"• Or run with --rotate to switch wallpapers from this script (any OS)")
@@ -0,0 +1,193 @@
+"""
+Character decks for the Hiragana Wallpaper Generator.
+
+A deck is the single source for both the wallpapers to generate and the
+reference chart drawn on them. Decks are JSON files:
+
+    {
+      "name": "hiragana",
+      "columns": ["A", "I", "U", "E", "O"],
+      "vowels": [["あ", "a", "ah"], ...],
+      "rows": [
+        {"label": "K", "group": "k", "kana": [["か", "ka", "mosquito"], ...]},
+        {"label": "G", "group": "k", "kana": [["が", "ga", "moth"], ...]},
+        ...
+      ]
+    }
+
+Each kana is [character, romaji, meaning], or null for an empty cell; every
+chart row needs at least one kana. "vowels" is an optional first chart row. Consecutive rows with the same
+group (default: the label) form one consonant group, e.g. K and G; the deck
+lists its entries group by group and column by column, so voiced kana
+follow their base kana (か, が, き, ぎ...).
+
+The built-in decks live in the decks/ folder next to this module; any other
+deck can be loaded by path. Decks are parsed on first use, not on import.
+"""
+
+import json
+import os
+from functools import lru_cache
+from itertools import groupby
+
+# Folder with the built-in deck files
+DECKS_DIR = os.path.join(os.path.dirname(__file__), "decks")
+
+DEFAULT_DECK = "hiragana"
+
+class Kana:
+    """One character of a deck and its place in the chart."""
+
+    __slots__ = ("char", "pronunciation", "meaning", "row", "column", "group", "index")
+
+    def __init__(self, char, pronunciation, meaning, row, column, group, index=0):
+        self.char = char
+        self.pronunciation = pronunciation
+        self.meaning = meaning
+        self.row = row
+        self.column = column
+        self.group = group
+        self.index = index
+
+    def as_dict(self):
+        """The entry dict used by the generator: char, pronunciation and meaning."""
+        return {"char": self.char, "pronunciation": self.pronunciation, "meaning": self.meaning}
+
+    def __repr__(self):
+        return f"Kana({self.char!r}, {self.pronunciation!r}, row={self.row}, column={self.column})"
+
+class Deck:
+    """A set of kana with O(1) lookups by character, romaji and chart position.
+
+    chart rows are numbered from 0, starting with the vowel row if the deck
+    has one. records are in deck order; entries holds the matching entry
+    dicts (see Kana.as_dict) for the generator.
+    """
+
+    def __init__(self, name, columns, rows, vowels=None):
+        self.name = name
+        self.columns = list(columns)
+        self.has_vowel_row = bool(vowels)
+        self.vowels = [cell[0] if cell else "" for cell in vowels or ()]
+        # Chart rows below the vowel row as (label, [char or ""])
+        self.rows = [(row["label"], [cell[0] if cell else "" for cell in row["kana"]]) for row in rows]
+
+        chart = ([(None, "vowels", vowels)] if vowels else []) + \
+                [(row["label"], row.get("group", row["label"]), row["kana"]) for row in rows]
+        for label, _, cells in chart:
+            if not any(cells[:len(self.columns)]):
+                raise ValueError(f"Chart row '{label or 'vowels'}' of deck '{name}' has no kana")
+        self.records = []
+        self.groups = []
+        for name, group_rows in groupby(enumerate(chart), key=lambda item: item[1][1]):
+            group = len(self.groups)
+            self.groups.append(name)
+            group_rows = list(group_rows)
+            for column in range(len(self.columns)):
+                for row, (_, _, cells) in group_rows:
+                    cell = cells[column] if column < len(cells) else None
+                    if cell:
+                        char, pronunciation, meaning = cell
+                        self.records.append(Kana(char, pronunciation, meaning, row, column, group,
+                                                 len(self.records)))
+        self._entries = None
+        self._chart_data = None
+        self._by_char = None
+        self._by_romaji = None
+        self._by_position = None
+
+    def _build_indexes(self):
+        self._by_char = {}
+        self._by_romaji = {}
+        self._by_position = {}
+        for record in self.records:
+            self._by_char.setdefault(record.char, record)
+            # Shared romaji ("ji" for じ and ぢ) keep the first kana
+            self._by_romaji.setdefault(record.pronunciation, record)
+            self._by_position[(record.row, record.column)] = record
+
+    @property
+    def entries(self):
+        """Entry dicts in deck order (built once, shared between calls)."""
+        if self._entries is None:
+            self._entries = [record.as_dict() for record in self.records]
+        return self._entries
+
+    def by_char(self, char):
+        """Return the Kana for a character, or None."""
+        if self._by_char is None:
+            self._build_indexes()
+        return self._by_char.get(char)
+
+    def by_romaji(self, romaji):
+        """Return the (first) Kana with this romaji, or None."""
+        if self._by_romaji is None:
+            self._build_indexes()
+        return self._by_romaji.get(romaji)
+
+    def at(self, row, column):
+        """Return the Kana at a chart position, or None for an empty cell."""
+        if self._by_position is None:
+            self._build_indexes()
+        return self._by_position.get((row, column))
+
+    def lookup(self, name):
+        """Find a Kana by character, then by romaji; None if neither matches."""
+        return self.by_char(name) or self.by_romaji(name)
+
+    def entry(self, name):
+        """Entry dict for a character or romaji, or None."""
+        record = self.lookup(name)
+        return None if record is None else self.entries[record.index]
+
+    def chart_data(self):
+        """Entries grouped by base sound, {"ka": [か, が], ...} as in data.HIRAGANA_CHART_DATA.
+
+        Built once and shared between calls, like entries.
+        """
+        if self._chart_data is None:
+            sounds = {}
+            for (group, column), records in groupby(self.records, key=lambda record: (record.group, record.column)):
+                records = list(records)
+                sounds[records[0].pronunciation] = [self.entries[record.index] for record in records]
+            self._chart_data = sounds
+        return self._chart_data
+
+    def chart_rows(self):
+        """Return (label, [char or ""]) for every chart row, the vowel row first with label None."""
+        return ([(None, self.vowels)] if self.has_vowel_row else []) + self.rows
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __repr__(self):
+        return f"Deck({self.name!r}, {len(self)} kana)"
+
+def available_decks():
+    """Return the names of the built-in decks."""
+    return sorted(os.path.splitext(name)[0] for name in os.listdir(DECKS_DIR) if name.endswith(".json"))
+
+def deck_path(deck):
+    """Resolve a built-in deck name or a path to a deck file."""
+    if os.path.sep in deck or deck.endswith(".json"):
+        return deck
+    path = os.path.join(DECKS_DIR, deck + ".json")
+    if not os.path.isfile(path):
+        raise ValueError(f"Unknown deck '{deck}' (built-in decks: {', '.join(available_decks())})")
+    return path
+
+@lru_cache(maxsize=None)
+def load_deck(deck=DEFAULT_DECK):
+    """Load a deck by built-in name or file path; each deck is parsed once."""
+    with open(deck_path(deck), encoding="utf-8") as f:
+        data = json.load(f)
+    return Deck(data["name"], data["columns"], data["rows"], data.get("vowels"))
+
+def get_deck(deck=None):
+    """Resolve None (the default deck), a deck name or path, or a Deck to a Deck."""
+    if isinstance(deck, Deck):
+        return deck
+    return load_deck(deck or DEFAULT_DECK)
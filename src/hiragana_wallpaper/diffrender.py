@@ -0,0 +1,109 @@
+"""
+Dirty-region rendering of consecutive wallpapers.
+
+Wallpapers of one size, theme and deck share everything but the hero
+character, its romaji and (with highlight) one chart cell. DiffRenderer keeps
+a single canvas: for each character it restores the regions the previous one
+drew from the cached background, draws the new character into it, and
+reports the rectangles that changed, so a display or stream can push just
+those. The pixels are the same as generate_wallpaper's.
+
+Restoring copies the background through two scratch tiles allocated up
+front (one sized for the hero glyphs, one for a highlighted chart cell), so
+rendering allocates no images.
+"""
+
+from .deck import get_deck
+from .generator import get_background, get_system_fonts, get_highlight_patch, _draw_hero
+from .layout import BASE_SIZE, get_layout
+from .profiling import stage
+from .themes import get_theme
+
+class DiffRenderer:
+    """Render wallpapers one after another into one reused canvas.
+
+    render() returns the canvas itself, which the next render() changes;
+    encode or copy it first if it is needed afterwards.
+    """
+
+    def __init__(self, size=BASE_SIZE, highlight=False, theme="plain", deck=None):
+        self.size = tuple(size)
+        self.highlight = highlight
+        self.colors = get_theme(theme)
+        self.deck = get_deck(deck)
+        self.layout = get_layout(*self.size)
+        self.fonts = get_system_fonts(self.size)
+        # Shared, cached background; only ever read from
+        self.base = get_background(self.size, self.colors, deck=self.deck)
+        self.canvas = self.base.copy()
+        # Scratch tiles for restoring, smallest first
+        from PIL import Image
+        hero = self.layout["hero_font_size"] + 2 * self.layout["romaji_font_size"]
+        cell = 2 * (self.layout["chart_font_jp_size"] + self.layout["highlight_padding"])
+        self._tiles = [Image.new(self.base.mode, (side, side)) for side in (cell, hero)]
+        self.dirty_rects = []
+        self._drawn = []
+        self._fresh = True
+
+    def _clip(self, box):
+        left, top, right, bottom = box
+        width, height = self.size
+        box = (max(left, 0), max(top, 0), min(right, width), min(bottom, height))
+        if box[0] >= box[2] or box[1] >= box[3]:
+            return None
+        return box
+
+    def _restore(self, box):
+        """Copy the background back over box, in place.
+
+        A tile is filled by pasting the background at a negative offset and
+        then pasted whole at the box's corner. Where the tile overhangs the
+        box the canvas already shows the background, so the extra pixels
+        are unchanged.
+        """
+        left, top, right, bottom = box
+        tile = next((tile for tile in self._tiles
+                     if tile.width >= right - left and tile.height >= bottom - top), self._tiles[-1])
+        for y in range(top, bottom, tile.height):
+            for x in range(left, right, tile.width):
+                tile.paste(self.base, (-x, -y))
+                self.canvas.paste(tile, (x, y))
+
+    def render(self, character_data):
+        """Draw character_data's wallpaper; returns (canvas, dirty rects).
+
+        The dirty rects are (left, top, right, bottom) boxes covering every
+        pixel that differs from the previous render (the whole canvas the
+        first time).
+        """
+        restored = list(self._drawn)
+        with stage("restore"):
+            for box in restored:
+                self._restore(box)
+
+        with stage("hero"):
+            drawn = _draw_hero(self.canvas, character_data, self.layout, *self.fonts,
+                               self.colors["text_primary"])
+
+        if self.highlight:
+            with stage("highlight"):
+                patch = get_highlight_patch(character_data["char"], self.size, self.colors, self.deck)
+                if patch is not None:
+                    image, (x, y) = patch
+                    self.canvas.paste(image, (x, y))
+                    drawn.append((x, y, x + image.width, y + image.height))
+
+        self._drawn = [box for box in map(self._clip, drawn) if box is not None]
+        if self._fresh:
+            self.dirty_rects = [(0, 0, *self.size)]
+            self._fresh = False
+        else:
+            self.dirty_rects = list(dict.fromkeys(restored + self._drawn))
+        return self.canvas, self.dirty_rects
+
+    def reset(self):
+        """Start over from the bare background (the next render is all dirty again)."""
+        self.canvas.paste(self.base)
+        self.dirty_rects = []
+        self._drawn = []
+        self._fresh = True
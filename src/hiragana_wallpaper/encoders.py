@@ -0,0 +1,143 @@
+"""
+Image encoding for the Hiragana Wallpaper Generator.
+
+Each output format has a set of presets: "default" (Pillow's defaults),
+"fast" (quickest encode) and "small" (smallest files). The plain theme only
+uses a few grey levels plus antialiasing, so the "png8" format stores it as
+an 8-bit greyscale or palette PNG, which is lossless and much smaller. Images
+with more than 256 colours (gradients, vignettes and noise of the other
+themes) cannot be stored that way exactly, so png8 writes them as ordinary
+RGB PNGs instead.
+"""
+
+import io
+import os
+import time
+from typing import NamedTuple
+
+# Output formats: Pillow format name, file extension, MIME type and encoder presets
+FORMATS = {
+    "png": {
+        "pillow_format": "PNG",
+        "extension": "png",
+        "mime_type": "image/png",
+        "presets": {
+            "default": {},
+            "fast": {"compress_level": 1},
+            "small": {"compress_level": 9, "optimize": True},
+        },
+    },
+    "png8": {
+        "pillow_format": "PNG",
+        "extension": "png",
+        "mime_type": "image/png",
+        "presets": {
+            "default": {},
+            "fast": {"compress_level": 1},
+            "small": {"compress_level": 9, "optimize": True},
+        },
+    },
+    "webp": {
+        "pillow_format": "WEBP",
+        "extension": "webp",
+        "mime_type": "image/webp",
+        "presets": {
+            "default": {"lossless": True},
+            "fast": {"lossless": True, "method": 1, "quality": 0},
+            "small": {"lossless": True, "method": 6, "quality": 100},
+        },
+    },
+    "jpeg": {
+        "pillow_format": "JPEG",
+        "extension": "jpg",
+        "mime_type": "image/jpeg",
+        "presets": {
+            "default": {"quality": 95},
+            "fast": {"quality": 90},
+            "small": {"quality": 85, "optimize": True, "progressive": True},
+        },
+    },
+    "avif": {
+        "pillow_format": "AVIF",
+        "extension": "avif",
+        "mime_type": "image/avif",
+        "presets": {
+            "default": {},
+            "fast": {"quality": 90, "speed": 10},
+            "small": {"quality": 75, "speed": 4},
+        },
+    },
+}
+
+PRESETS = ["default", "fast", "small"]
+
+class EncodeResult(NamedTuple):
+    """Size and timing of one encoded image."""
+    path: str
+    bytes: int
+    seconds: float
+
+# Encoders that are optional parts of Pillow
+OPTIONAL_CODECS = ("webp", "avif")
+
+def format_available(fmt):
+    """Whether the installed Pillow can write an output format."""
+    module = FORMATS[fmt]["pillow_format"].lower()
+    if module not in OPTIONAL_CODECS:
+        return True
+    from PIL import features
+    return features.check(module)
+
+def available_formats():
+    """Return the output formats supported by the installed Pillow."""
+    return [name for name in FORMATS if format_available(name)]
+
+def file_extension(fmt):
+    """File extension (without dot) for an output format."""
+    return FORMATS[fmt]["extension"]
+
+def mime_type(fmt):
+    """MIME type for an output format."""
+    return FORMATS[fmt]["mime_type"]
+
+def to_palette(img):
+    """Reduce an RGB wallpaper to an 8-bit image, only where that is lossless.
+
+    Grey-only images become "L" and images with at most 256 colours a
+    palette image, both exact. Images with more colours are returned
+    unchanged, since quantizing them would alter pixels.
+    """
+    from PIL import Image
+    colors = img.getcolors(256)
+    if colors is None:
+        return img
+    if all(r == g == b for _, (r, g, b) in colors):
+        return img.convert("L")
+    return img.quantize(256, method=Image.Quantize.MEDIANCUT, dither=Image.Dither.NONE)
+
+def _check(fmt, preset):
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown format {fmt!r}: use one of {', '.join(FORMATS)}")
+    if preset not in PRESETS:
+        raise ValueError(f"unknown preset {preset!r}: use one of {', '.join(PRESETS)}")
+
+def encode_to(img, fp, fmt="png", preset="default"):
+    """Encode an image into a path or file object."""
+    _check(fmt, preset)
+    spec = FORMATS[fmt]
+    if fmt == "png8":
+        img = to_palette(img)
+    img.save(fp, spec["pillow_format"], **spec["presets"][preset])
+
+def encode_image(img, fmt="png", preset="default"):
+    """Encode an image and return the bytes."""
+    buffer = io.BytesIO()
+    encode_to(img, buffer, fmt, preset)
+    return buffer.getvalue()
+
+def save_image(img, path, fmt="png", preset="default"):
+    """Encode an image to a file and report its size and encode time."""
+    start = time.perf_counter()
+    encode_to(img, path, fmt, preset)
+    seconds = time.perf_counter() - start
+    return EncodeResult(path, os.path.getsize(path), seconds)
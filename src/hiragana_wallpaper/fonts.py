@@ -0,0 +1,129 @@
+"""
+Font discovery and caching for the Hiragana Wallpaper Generator.
+
+Fonts are looked up once per role ("japanese" or "english") along a
+configurable search path, and loaded TrueType faces are kept in a bounded
+LRU cache keyed by (path, size, face index) so every wallpaper in a run
+shares the same parsed font objects.
+"""
+
+import os
+from functools import lru_cache
+
+# Environment variable with extra font directories (os.pathsep separated),
+# searched before the built-in locations below.
+FONT_PATH_ENV = "HIRAGANA_FONT_PATH"
+
+# Environment variables naming the font file to use for a role, instead of
+# searching for one (e.g. to render with the same font on every machine).
+FONT_FILE_ENV = {
+    "japanese": "HIRAGANA_FONT_JAPANESE",
+    "english": "HIRAGANA_FONT_ENGLISH",
+}
+
+# Directories searched for font files, in order (macOS first, then Linux)
+FONT_SEARCH_PATH = [
+    "/System/Library/Fonts",
+    "/Library/Fonts",
+    "/usr/share/fonts/opentype/noto",
+    "/usr/share/fonts/noto-cjk",
+    "/usr/share/fonts/google-noto-cjk",
+    "/usr/share/fonts/truetype/noto",
+    "/usr/share/fonts/truetype/dejavu",
+    "/usr/share/fonts/truetype/liberation",
+    "~/.local/share/fonts",
+    "~/.fonts",
+]
+
+# Candidate font files for each role as (filename, face index), best first
+FONT_CANDIDATES = {
+    "japanese": [
+        ("Hiragino Sans GB.ttc", 0),
+        ("Arial Unicode MS.ttf", 0),
+        ("NotoSansCJK-Regular.ttc", 0),   # face 0 is the JP variant
+        ("NotoSansCJKjp-Regular.otf", 0),
+        ("NotoSansJP-Regular.otf", 0),
+        ("NotoSansJP-Regular.ttf", 0),
+    ],
+    "english": [
+        ("Helvetica.ttc", 0),
+        ("Arial.ttf", 0),
+        ("DejaVuSans.ttf", 0),
+        ("LiberationSans-Regular.ttf", 0),
+    ],
+}
+
+# Maximum number of loaded font faces kept in memory
+FONT_CACHE_SIZE = 32
+
+def get_font_search_path():
+    """Return the directories searched for fonts, environment entries first."""
+    extra = os.environ.get(FONT_PATH_ENV, "")
+    dirs = [d for d in extra.split(os.pathsep) if d] + FONT_SEARCH_PATH
+    return [os.path.expanduser(d) for d in dirs]
+
+def set_font_search_path(dirs):
+    """Replace the built-in font search path and forget previous lookups."""
+    FONT_SEARCH_PATH[:] = list(dirs)
+    clear_font_cache()
+
+@lru_cache(maxsize=None)
+def find_font(role):
+    """Find the best available font file for a role.
+
+    Returns a (path, index) tuple, or (None, 0) when no candidate exists and
+    Pillow's built-in default font has to be used instead. A file named in
+    the role's FONT_FILE_ENV variable is used as is, and must exist.
+    """
+    override = os.environ.get(FONT_FILE_ENV[role])
+    if override:
+        path = os.path.expanduser(override)
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"{FONT_FILE_ENV[role]} names a font file that does not exist: {path}")
+        return path, 0
+
+    search_path = get_font_search_path()
+    for filename, index in FONT_CANDIDATES[role]:
+        for directory in search_path:
+            path = os.path.join(directory, filename)
+            if os.path.isfile(path):
+                return path, index
+
+    if role == "japanese":
+        print("Warning: Using default fonts. Japanese characters may not render properly.")
+    return None, 0
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def load_font(path, size, index=0):
+    """Load a font face, reusing a cached instance for the same (path, size, index)."""
+    # Pillow is imported on first use, so font lookups alone stay cheap
+    from PIL import ImageFont
+    if path is None:
+        return ImageFont.load_default(size)
+    return ImageFont.truetype(path, size, index=index)
+
+def get_font(role, size):
+    """Get the cached font for a role ("japanese" or "english") at a pixel size."""
+    path, index = find_font(role)
+    return load_font(path, size, index)
+
+def font_fingerprint():
+    """Describe the font files in use by path, size and modification time."""
+    fingerprint = {}
+    for role in ("japanese", "english"):
+        path, index = find_font(role)
+        if path is None:
+            fingerprint[role] = None
+            continue
+        stat = os.stat(path)
+        fingerprint[role] = [path, index, stat.st_size, int(stat.st_mtime)]
+    return fingerprint
+
+def font_cache_info():
+    """Return hit/miss statistics for the loaded-font cache."""
+    return load_font.cache_info()
+
+def clear_font_cache():
+    """Drop all cached font lookups and loaded faces."""
+    find_font.cache_clear()
+    load_font.cache_clear()
@@ -2,9 +2,19 @@
 Core wallpaper generation functionality for Hiragana characters.
 """
 
+import json
 import os
-from PIL import Image, ImageDraw, ImageFont
-from .data import HIRAGANA_DATA, COLORS
+from functools import lru_cache
+from .data import COLORS
+from .deck import get_deck
+from .fonts import get_font, find_font
+from .glyphs import draw_glyph, text_bbox, clear_glyph_cache
+from .layout import BASE_SIZE, get_layout
+from .profiling import stage
+from .themes import get_theme, theme_key, needs_compositing, compose_background
+
+# Bump whenever a change to the drawing code alters the rendered output
+GENERATOR_VERSION = "2"
 
 def create_output_directory(output_dir="hiragana_wallpapers"):
     """Create the output directory if it doesn't exist."""
@@ -14,144 +24,301 @@ def create_output_directory(output_dir="hiragana_wallpapers"):
     else:
         print(f"Directory {output_dir} already exists")
 
-def get_system_fonts():
+def get_system_fonts(size=BASE_SIZE):
     """Get system fonts for Japanese and English text."""
-    try:
-        # Try to load Japanese font first (common on macOS) - even larger main character size
-        japanese_font = ImageFont.truetype("/System/Library/Fonts/Hiragino Sans GB.ttc", 260)
-        english_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 60)
-    except OSError:
-        try:
-            # Fallback fonts
-            japanese_font = ImageFont.truetype("/System/Library/Fonts/Arial Unicode MS.ttf", 260)
-            english_font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 60)
-        except OSError:
-            # Default fonts if system fonts not found
-            japanese_font = ImageFont.load_default()
-            english_font = ImageFont.load_default()
-            print("Warning: Using default fonts. Japanese characters may not render properly.")
+    # Faces come from the shared font cache, so repeated calls are cheap
+    layout = get_layout(*size)
+    japanese_font = get_font("japanese", layout["hero_font_size"])
+    english_font = get_font("english", layout["romaji_font_size"])
     
     return japanese_font, english_font
 
-def draw_reference_chart(draw, start_x, start_y, chart_width, font_jp, font_en):
-    """Draw a simplified reference chart on the right side."""
+def get_chart_fonts(size=BASE_SIZE):
+    """Get the (Japanese, English) fonts used in the reference chart."""
+    layout = get_layout(*size)
+    return (get_font("japanese", layout["chart_font_jp_size"]),
+            get_font("english", layout["chart_font_en_size"]))
+
+# Number of pre-rendered chart layers / backgrounds kept in memory
+LAYER_CACHE_SIZE = 8
+
+def chart_cell_positions(start_x, start_y, chart_width, font_jp, layout=None, deck=None):
+    """Return (char, (x, y)) drawing positions for every kana in the reference chart."""
+    if layout is None:
+        layout = get_layout(*BASE_SIZE)
+    deck = get_deck(deck)
+    
     # Chart dimensions
-    cell_width = chart_width // 5  # 5 columns
-    row_height = 55  # increased for larger fonts
+    cell_width = chart_width // len(deck.columns)  # one column per vowel
+    row_height = layout["row_height"]  # increased for larger fonts
+    cell_offset = layout["cell_offset"]
     
-    # Header row (vowels A, I, U, E, O) - with tighter spacing
-    vowels = ["A", "I", "U", "E", "O"]
-    for i, vowel in enumerate(vowels):
-        x = start_x + i * (cell_width * 0.65) + cell_width // 2  # match the tighter column spacing
-        y = start_y
-        bbox = draw.textbbox((0, 0), vowel, font=font_en)
-        text_width = bbox[2] - bbox[0]
-        draw.text((x - text_width // 2, y), vowel, font=font_en, fill=COLORS["text_primary"])
-    
-    # First row - vowel sounds (あ い う え お)
-    vowel_row_label = "(vowels)"
-    vowel_characters = ["あ", "い", "う", "え", "お"]
-    
-    # Draw vowel row header
-    vowel_row_y = start_y + row_height
-    bbox = draw.textbbox((0, 0), vowel_row_label, font=font_en)
-    text_width = bbox[2] - bbox[0]
-    header_x = start_x - text_width - 10
-    draw.text((header_x, vowel_row_y), vowel_row_label, font=font_en, fill=COLORS["text_primary"])
-    
-    # Draw vowel characters
-    for col_idx, char in enumerate(vowel_characters):
-        cell_x = start_x + col_idx * (cell_width * 0.65)
-        cell_y = vowel_row_y + 5
-        
-        # Center character in cell
-        char_bbox = draw.textbbox((0, 0), char, font=font_jp)
-        char_width = char_bbox[2] - char_bbox[0]
-        char_x = cell_x + (cell_width - char_width) // 2
-        
-        draw.text((char_x, cell_y), char, font=font_jp, fill=COLORS["text_primary"])
-    
-    # Simplified chart data - organized by vowel columns (A,I,U,E,O)
-    chart_rows = [
-        # K-G sound rows (showing k/g variants)
-        ("K", ["か", "き", "く", "け", "こ"]),
-        ("G", ["が", "ぎ", "ぐ", "げ", "ご"]),
-        # S-Z sound rows
-        ("S", ["さ", "し", "す", "せ", "そ"]),
-        ("Z", ["ざ", "じ", "ず", "ぜ", "ぞ"]),
-        # T-D sound rows
-        ("T", ["た", "ち", "つ", "て", "と"]),
-        ("D", ["だ", "ぢ", "づ", "で", "ど"]),
-        # N sound row
-        ("N", ["な", "に", "ぬ", "ね", "の"]),
-        # H sound rows (showing h/b/p variants)
-        ("H", ["は", "ひ", "ふ", "へ", "ほ"]),
-        ("B", ["ば", "び", "ぶ", "べ", "ぼ"]),
-        ("P", ["ぱ", "ぴ", "ぷ", "ぺ", "ぽ"]),
-        # M sound row
-        ("M", ["ま", "み", "む", "め", "も"]),
-        # Y sound row
-        ("Y", ["や", "", "ゆ", "", "よ"]),
-        # R sound row
-        ("R", ["ら", "り", "る", "れ", "ろ"]),
-        # W sound row
-        ("W", ["わ", "", "", "", "を"]),
-        # Final row (n sound)
-        ("N", ["ん", "", "", "", ""])
-    ]
-    
-    # Draw rows (adjusted for vowel row)
-    for row_idx, (row_label, characters) in enumerate(chart_rows):
-        row_y = start_y + row_height * 2 + row_idx * row_height  # Skip vowel row
-        
-        # Draw row header
-        header_x = start_x - 60
-        draw.text((header_x, row_y), row_label, font=font_en, fill=COLORS["text_primary"])
+    positions = []
+    
+    for row_idx, (row_label, characters) in enumerate(deck.chart_rows()):
+        row_y = start_y + row_height + row_idx * row_height  # Skip header row
         
-        # Draw characters with tighter column spacing
+        # Characters with tighter column spacing
         for col_idx, char in enumerate(characters):
             if char:  # Only draw if character exists
                 # Reduce the cell spacing for tighter layout
                 cell_x = start_x + col_idx * (cell_width * 0.65)  # reduce spacing between columns even more
-                cell_y = row_y + 5  # Small vertical offset
+                cell_y = row_y + cell_offset  # Small vertical offset
                 
                 # Center character in cell
-                char_bbox = draw.textbbox((0, 0), char, font=font_jp)
-                char_width = char_bbox[2] + char_bbox[0]
+                char_bbox = text_bbox(char, font_jp)
+                if row_label is None:  # vowel row
+                    char_width = char_bbox[2] - char_bbox[0]
+                else:
+                    char_width = char_bbox[2] + char_bbox[0]
                 char_x = cell_x + (cell_width - char_width) // 2
                 
-                draw.text((char_x, cell_y), char, font=font_jp, fill=COLORS["text_primary"])
+                positions.append((char, (char_x, cell_y)))
+    
+    return positions
 
-def generate_wallpaper(character_data):
-    """Generate a single wallpaper image with main character and reference chart."""
-    # Standard Mac wallpaper dimensions (16:10 ratio)
-    width, height = 2880, 1800
+def chart_text_items(start_x, start_y, chart_width, font_jp, font_en, layout=None, deck=None):
+    """Return (xy, text, font) for every label and kana in the reference chart."""
+    if layout is None:
+        layout = get_layout(*BASE_SIZE)
+    deck = get_deck(deck)
+    
+    # Chart dimensions
+    cell_width = chart_width // len(deck.columns)  # one column per vowel
+    row_height = layout["row_height"]  # increased for larger fonts
     
-    # Create image with dark background
-    img = Image.new('RGB', (width, height), COLORS["background"])
-    draw = ImageDraw.Draw(img)
+    items = []
+    
+    # Header row (vowels A, I, U, E, O) - with tighter spacing
+    for i, vowel in enumerate(deck.columns):
+        x = start_x + i * (cell_width * 0.65) + cell_width // 2  # match the tighter column spacing
+        y = start_y
+        bbox = text_bbox(vowel, font_en)
+        text_width = bbox[2] - bbox[0]
+        items.append(((x - text_width // 2, y), vowel, font_en))
+    
+    # Row headers
+    for row_idx, (row_label, characters) in enumerate(deck.chart_rows()):
+        row_y = start_y + row_height + row_idx * row_height  # Skip header row
+        if row_label is None:
+            # Vowel row header, right-aligned against the chart
+            row_label = "(vowels)"
+            bbox = text_bbox(row_label, font_en)
+            text_width = bbox[2] - bbox[0]
+            header_x = start_x - text_width - layout["vowel_label_gap"]
+        else:
+            header_x = start_x - layout["row_label_offset"]
+        items.append(((header_x, row_y), row_label, font_en))
+    
+    # Kana cells
+    for char, position in chart_cell_positions(start_x, start_y, chart_width, font_jp, layout, deck):
+        items.append((position, char, font_jp))
+    
+    return items
+
+def _default_chart_args(font_jp, font_en, fill, layout):
+    if layout is None:
+        layout = get_layout(*BASE_SIZE)
+    if font_jp is None:
+        font_jp = get_font("japanese", layout["chart_font_jp_size"])
+    if font_en is None:
+        font_en = get_font("english", layout["chart_font_en_size"])
+    if fill is None:
+        fill = COLORS["text_primary"]
+    return font_jp, font_en, fill, layout
+
+def draw_reference_chart(draw, start_x, start_y, chart_width, font_jp=None, font_en=None, fill=None, layout=None,
+                         deck=None):
+    """Draw a simplified reference chart of a deck (default: hiragana) on the right side with ImageDraw."""
+    # Default to the base layout, its chart fonts and the primary text colour
+    font_jp, font_en, fill, layout = _default_chart_args(font_jp, font_en, fill, layout)
+    for xy, text, font in chart_text_items(start_x, start_y, chart_width, font_jp, font_en, layout, deck):
+        draw.text(xy, text, font=font, fill=fill)
+
+def paint_reference_chart(img, start_x, start_y, chart_width, font_jp=None, font_en=None, fill=None, layout=None,
+                          deck=None):
+    """Paint the reference chart onto img from cached glyph masks (same pixels as draw_reference_chart)."""
+    font_jp, font_en, fill, layout = _default_chart_args(font_jp, font_en, fill, layout)
+    for xy, text, font in chart_text_items(start_x, start_y, chart_width, font_jp, font_en, layout, deck):
+        draw_glyph(img, xy, text, font, fill)
+
+def _chart_geometry(width, height):
+    """Return (start_x, start_y, chart_width) of the reference chart for an image size."""
+    layout = get_layout(width, height)
+    return layout["chart_x"], layout["chart_y"], layout["chart_width"]
+
+def _font_key():
+    """Identify the fonts in use, so cached layers follow font changes."""
+    return find_font("japanese"), find_font("english")
+
+def _colors_key(colors):
+    return tuple(sorted((name, colors[name]) for name in COLORS if name in colors))
+
+@lru_cache(maxsize=LAYER_CACHE_SIZE)
+def _render_chart_layer(size, font_key, deck):
+    # Pillow is imported on first render, so importing the package stays cheap
+    from PIL import Image
+    layout = get_layout(*size)
+    layer = Image.new("L", size, 0)
+    paint_reference_chart(layer, *_chart_geometry(*size), *get_chart_fonts(size), fill=255, layout=layout,
+                          deck=deck)
+    return layer
+
+def get_chart_layer(size=BASE_SIZE, deck=None):
+    """Get the reference chart for an image size as a cached coverage mask ("L" image).
+
+    The mask is theme independent: paste a colour through it to draw the chart.
+    It is shared between calls, so do not modify it.
+    """
+    return _render_chart_layer(tuple(size), _font_key(), get_deck(deck))
+
+@lru_cache(maxsize=LAYER_CACHE_SIZE)
+def _render_background(size, colors_key, font_key, deck):
+    from PIL import Image
+    colors = dict(colors_key)
+    img = Image.new("RGB", size, colors["background"])
+    img.paste(colors["text_primary"], (0, 0), _render_chart_layer(size, font_key, deck))
+    return img
+
+def chart_bands(size=BASE_SIZE, deck=None):
+    """Return (top, bottom, group) pixel rows of each kana row in the reference chart.
+
+    group is the index of the row's consonant group in the deck, used for accent colours.
+    """
+    layout = get_layout(*size)
+    start_y = layout["chart_y"]
+    row_height = layout["row_height"]
+    deck = get_deck(deck)
+    
+    bands = []
+    for row_idx, (row_label, characters) in enumerate(deck.chart_rows()):
+        row_y = start_y + row_height + row_idx * row_height
+        column = next(col_idx for col_idx, char in enumerate(characters) if char)
+        bands.append((row_y, row_y + row_height, deck.at(row_idx, column).group))
+    return bands
+
+@lru_cache(maxsize=LAYER_CACHE_SIZE)
+def _render_themed_background(size, key, font_key, deck):
+    with stage("compose"):
+        return compose_background(size, json.loads(key), _render_chart_layer(size, font_key, deck),
+                                  chart_bands(size, deck))
+
+def get_background(size=BASE_SIZE, colors=None, theme="plain", deck=None):
+    """Get the static part of every wallpaper (background and reference chart).
+
+    colors defaults to the theme's colours (see themes.THEMES). Themes with
+    gradients, a vignette, noise or accents are composited with NumPy. The
+    image is cached per (size, theme, fonts, deck) and shared between calls;
+    copy it before drawing on it.
+    """
+    if colors is None:
+        colors = get_theme(theme)
+    if needs_compositing(colors):
+        return _render_themed_background(tuple(size), theme_key(colors), _font_key(), get_deck(deck))
+    return _render_background(tuple(size), _colors_key(colors), _font_key(), get_deck(deck))
+
+@lru_cache(maxsize=256)
+def _render_highlight_patch(char, size, colors_key, font_key, deck):
+    from PIL import Image
+    colors = dict(colors_key)
+    layout = get_layout(*size)
+    font_jp, _ = get_chart_fonts(size)
+    for cell_char, (x, y) in chart_cell_positions(*_chart_geometry(*size), font_jp, layout, deck):
+        if cell_char == char:
+            break
+    else:
+        return None
+    
+    # Inverted cell: primary colour block with the character cut out in background colour
+    padding = layout["highlight_padding"]
+    left, top, right, bottom = text_bbox(char, font_jp)
+    box = (int(x) + left - padding, int(y) + top - padding,
+           int(x) + right + padding, int(y) + bottom + padding)
+    patch = Image.new("RGB", (box[2] - box[0], box[3] - box[1]), colors["text_primary"])
+    draw_glyph(patch, (x - box[0], y - box[1]), char, font_jp, colors["background"])
+    return patch, box[:2]
+
+def get_highlight_patch(char, size=BASE_SIZE, colors=None, deck=None):
+    """Get a small (image, (x, y)) patch that highlights a character's chart cell.
+
+    Returns None if the character is not part of the reference chart.
+    """
+    if colors is None:
+        colors = COLORS
+    deck = get_deck(deck)
+    if deck.by_char(char) is None:
+        return None
+    return _render_highlight_patch(char, tuple(size), _colors_key(colors), _font_key(), deck)
+
+def clear_render_cache():
+    """Drop all cached chart layers, backgrounds, highlight patches and glyphs."""
+    _render_chart_layer.cache_clear()
+    _render_background.cache_clear()
+    _render_themed_background.cache_clear()
+    _render_highlight_patch.cache_clear()
+    clear_glyph_cache()
+
+def warm_caches(entries=(), size=BASE_SIZE, theme="plain", deck=None):
+    """Load fonts, the chart background and the glyphs of entries ahead of rendering."""
+    japanese_font, english_font = get_system_fonts(size)
+    get_chart_fonts(size)
+    get_background(size, theme=theme, deck=deck)
+    for character_data in entries:
+        text_bbox(character_data["char"], japanese_font)
+        text_bbox(character_data["pronunciation"], english_font)
+
+def generate_wallpaper(character_data, highlight=False, size=BASE_SIZE, theme="plain", deck=None):
+    """Generate a single wallpaper image with main character and reference chart.
+    
+    The background and reference chart come from a cached layer; only the main
+    character and its pronunciation are pasted per image, from cached glyph
+    masks. With highlight=True the character's cell in the chart is overlaid
+    with a highlight patch. size is (width, height); the layout scales from
+    the 2880x1800 design. theme names an entry of themes.THEMES, and deck
+    the deck whose chart is drawn (default: hiragana, see deck.load_deck).
+    """
+    width, height = size
+    layout = get_layout(width, height)
+    colors = get_theme(theme)
+    deck = get_deck(deck)
+    
+    # Start from the pre-rendered background and reference chart
+    with stage("background"):
+        img = get_background((width, height), colors, deck=deck).copy()
     
     # Get fonts
-    japanese_font, english_font = get_system_fonts()
+    with stage("fonts"):
+        japanese_font, english_font = get_system_fonts((width, height))
+    
+    with stage("hero"):
+        _draw_hero(img, character_data, layout, japanese_font, english_font, colors["text_primary"])
     
-    # Try to get chart fonts, fallback to system fonts if needed: larger chart fonts
-    try:
-        chart_font_jp = ImageFont.truetype("/System/Library/Fonts/Hiragino Sans GB.ttc", 36)
-        chart_font_en = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 20)
-    except OSError:
-        chart_font_jp = japanese_font
-        chart_font_en = english_font
+    # Highlight the character's chart cell
+    if highlight:
+        with stage("highlight"):
+            patch = get_highlight_patch(character_data["char"], (width, height), colors, deck)
+            if patch is not None:
+                img.paste(*patch)
     
-    # Main content area (left 1/2 - smaller to give more space for reference chart)
-    main_width = int(width * 0.5)
+    return img
+
+def _draw_hero(img, character_data, layout, japanese_font, english_font, fill=COLORS["text_primary"]):
+    """Draw the main character and its pronunciation, centered in the hero area.
+
+    Returns the boxes drawn into (see glyphs.draw_glyph).
+    """
+    # Main content area (left half in landscape, top half in portrait)
+    box_left, box_top, box_right, box_bottom = layout["hero_box"]
+    main_width = box_right - box_left
+    main_height = box_bottom - box_top
     
     # Get character data
     char = character_data["char"]
     pronunciation = character_data["pronunciation"]
     
-    # Calculate positions for main character (centered in left area)
-    char_bbox = draw.textbbox((0, 0), char, font=japanese_font)
-    pronunciation_bbox = draw.textbbox((0, 0), pronunciation, font=english_font)
+    # Calculate positions for main character (centered in main area)
+    char_bbox = text_bbox(char, japanese_font)
+    pronunciation_bbox = text_bbox(pronunciation, english_font)
     
     char_width = char_bbox[2] - char_bbox[0]
     pronunciation_width = pronunciation_bbox[2] - pronunciation_bbox[0]
@@ -159,26 +326,17 @@ def generate_wallpaper(character_data):
     char_height = char_bbox[3] - char_bbox[1]
     pronunciation_height = pronunciation_bbox[3] - pronunciation_bbox[1]
     
-    # Center main content vertically in left area - just character and pronunciation
-    total_height = char_height + pronunciation_height + 100  # generous spacing
-    start_y = (height - total_height) // 2
+    # Center main content vertically in main area - just character and pronunciation
+    total_height = char_height + pronunciation_height + layout["hero_spacing"]  # generous spacing
+    start_y = box_top + (main_height - total_height) // 2
     
-    # Draw the main Hiragana character (large, white) in left area
-    char_x = (main_width - char_width) // 2
+    # Draw the main Hiragana character (large, white) in main area
+    char_x = box_left + (main_width - char_width) // 2
     char_y = start_y
-    draw.text((char_x, char_y), char, font=japanese_font, fill=COLORS["text_primary"])
+    char_box = draw_glyph(img, (char_x, char_y), char, japanese_font, fill)
     
     # Draw pronunciation (with increased spacing after character)
-    pron_x = (main_width - pronunciation_width) // 2
-    pron_y = char_y + char_height + 80  # increased spacing from 50 to 80
-    draw.text((pron_x, pron_y), pronunciation, font=english_font, fill=COLORS["text_primary"])
-    
-    
-    # Draw reference chart (right side) - moved down and larger
-    chart_start_x = main_width + 20
-    chart_start_y = 150  # moved down significantly
-    chart_width = width - chart_start_x - 20
-    
-    draw_reference_chart(draw, chart_start_x, chart_start_y, chart_width, chart_font_jp, chart_font_en)
-    
-    return img
+    pron_x = box_left + (main_width - pronunciation_width) // 2
+    pron_y = char_y + char_height + layout["hero_gap"]  # increased spacing from 50 to 80
+    pronunciation_box = draw_glyph(img, (pron_x, pron_y), pronunciation, english_font, fill)
+    return [box for box in (char_box, pronunciation_box) if box is not None]
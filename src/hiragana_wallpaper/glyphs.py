@@ -0,0 +1,152 @@
+"""
+Glyph mask cache for the Hiragana Wallpaper Generator.
+
+Text is rasterized once per (text, font, size, sub-pixel offset) into an "L"
+coverage mask and kept in a bounded LRU cache. Drawing is then a paste of a
+colour through the mask, which gives exactly the pixels ImageDraw.text would.
+The cache can be saved to disk and loaded again in a later run.
+"""
+
+import json
+import math
+import os
+from collections import OrderedDict
+from .fonts import font_fingerprint
+
+# Maximum number of glyph masks kept in memory
+GLYPH_CACHE_SIZE = 4096
+
+# Bump when the cache file layout changes
+GLYPH_CACHE_VERSION = 1
+
+_glyphs = OrderedDict()
+_stats = {"hits": 0, "misses": 0}
+
+def _font_id(font):
+    """Stable identity of a font face, usable across processes and runs."""
+    path = getattr(font, "path", None)
+    if not isinstance(path, str):
+        path = "<default>"
+    return path, getattr(font, "index", 0), getattr(font, "size", 0)
+
+def _rasterize(text, font, fraction):
+    """Render text into a tight coverage mask.
+
+    Returns (mask, offset, bbox): the mask, its position relative to the
+    integer part of the drawing position, and the text's bounding box.
+    """
+    from PIL import Image, ImageDraw
+    bbox = font.getbbox(text)
+    # Draw with generous padding so the mask has the same sub-pixel start
+    # as the real position, and nothing gets clipped
+    pad = int(getattr(font, "size", 10)) + 2
+    canvas = Image.new("L", (bbox[2] + 2 * pad, bbox[3] + 2 * pad), 0)
+    ImageDraw.Draw(canvas).text((pad + fraction[0], pad + fraction[1]), text, font=font, fill=255)
+
+    ink = canvas.getbbox()
+    if ink is None:
+        return None, (0, 0), bbox
+    return canvas.crop(ink), (ink[0] - pad, ink[1] - pad), bbox
+
+def get_glyph(text, font, fraction=(0.0, 0.0)):
+    """Get the cached (mask, offset, bbox) for text drawn with font.
+
+    fraction is the sub-pixel part of the drawing position. mask is None for
+    text without ink (e.g. spaces).
+    """
+    key = (text, _font_id(font), fraction)
+    glyph = _glyphs.get(key)
+    if glyph is not None:
+        _stats["hits"] += 1
+        _glyphs.move_to_end(key)
+        return glyph
+
+    _stats["misses"] += 1
+    glyph = _rasterize(text, font, fraction)
+    _glyphs[key] = glyph
+    if len(_glyphs) > GLYPH_CACHE_SIZE:
+        _glyphs.popitem(last=False)
+    return glyph
+
+def draw_glyph(img, xy, text, font, fill):
+    """Draw text onto img by pasting its cached mask; same pixels as ImageDraw.text.
+
+    Returns the (left, top, right, bottom) box of the pixels it may have
+    changed, or None for text without ink.
+    """
+    x, y = xy
+    mask, offset, _ = get_glyph(text, font, (math.modf(x)[0], math.modf(y)[0]))
+    if mask is None:
+        return None
+    left, top = int(x) + offset[0], int(y) + offset[1]
+    img.paste(fill, (left, top), mask)
+    return left, top, left + mask.width, top + mask.height
+
+def text_bbox(text, font):
+    """Bounding box of text as drawn at (0, 0), from the glyph cache."""
+    return get_glyph(text, font)[2]
+
+def glyph_cache_info():
+    """Return hits, misses and the number of cached glyphs."""
+    return {"hits": _stats["hits"], "misses": _stats["misses"], "size": len(_glyphs)}
+
+def clear_glyph_cache():
+    """Drop all cached glyphs and reset the statistics."""
+    _glyphs.clear()
+    _stats["hits"] = _stats["misses"] = 0
+
+def save_glyph_cache(path):
+    """Write the glyph cache to a file, tagged with the fonts in use.
+
+    The file is a JSON header line describing every glyph, followed by the
+    raw mask bytes.
+    """
+    entries = []
+    blobs = []
+    position = 0
+    for (text, font_id, fraction), (mask, offset, bbox) in _glyphs.items():
+        if mask is None:
+            mask_size, data = None, b""
+        else:
+            mask_size, data = list(mask.size), mask.tobytes()
+        entries.append([text, list(font_id), list(fraction), list(offset), list(bbox),
+                        mask_size, position, len(data)])
+        blobs.append(data)
+        position += len(data)
+    header = {"version": GLYPH_CACHE_VERSION, "fonts": font_fingerprint(), "glyphs": entries}
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(json.dumps(header, ensure_ascii=False).encode("utf-8") + b"\n")
+        for data in blobs:
+            f.write(data)
+    os.replace(tmp_path, path)
+
+def load_glyph_cache(path):
+    """Load glyphs saved by save_glyph_cache; returns how many were loaded.
+
+    Files that are missing, unreadable or made with other font files are ignored.
+    """
+    try:
+        with open(path, "rb") as f:
+            header = json.loads(f.readline())
+            blob = f.read()
+    except (OSError, ValueError):
+        return 0
+    if (not isinstance(header, dict)
+            or header.get("version") != GLYPH_CACHE_VERSION
+            or header.get("fonts") != font_fingerprint()):
+        return 0
+
+    from PIL import Image
+    for text, font_id, fraction, offset, bbox, mask_size, position, length in header["glyphs"]:
+        mask = None
+        if mask_size is not None:
+            mask = Image.frombytes("L", tuple(mask_size), blob[position:position + length])
+        _glyphs[(text, tuple(font_id), tuple(fraction))] = (mask, tuple(offset), tuple(bbox))
+    while len(_glyphs) > GLYPH_CACHE_SIZE:
+        _glyphs.popitem(last=False)
+    return len(header["glyphs"])
@@ -0,0 +1,99 @@
+"""
+Resolution-independent layout for the Hiragana wallpapers.
+
+All distances and font sizes are defined once for the reference 2880x1800
+design and scaled to the target size. Landscape images keep the character
+on the left and the chart on the right; portrait images stack them.
+"""
+
+import re
+from functools import lru_cache
+
+# The size the layout was designed at (Mac retina, 16:10)
+BASE_SIZE = (2880, 1800)
+
+# Layout values at BASE_SIZE, in pixels
+BASE_LAYOUT = {
+    "hero_font_size": 260,      # main Hiragana character
+    "romaji_font_size": 60,     # pronunciation under the main character
+    "chart_font_jp_size": 36,   # kana in the reference chart
+    "chart_font_en_size": 20,   # chart row and column labels
+    "hero_gap": 80,             # space between character and pronunciation
+    "hero_spacing": 100,        # extra height used to center the hero block
+    "chart_margin": 20,         # gap around the chart area
+    "chart_top": 150,           # chart distance from the top of its area
+    "row_height": 55,           # chart row pitch
+    "cell_offset": 5,           # kana offset below the row baseline
+    "row_label_offset": 60,     # row label distance left of the chart
+    "vowel_label_gap": 10,      # gap between "(vowels)" and the chart
+    "highlight_padding": 6,     # padding around a highlighted chart cell
+    "portrait_label_space": 140,  # room for row labels in portrait mode
+}
+
+# Named display sizes accepted by parse_size
+SIZE_PRESETS = {
+    "retina": (2880, 1800),
+    "1080p": (1920, 1080),
+    "1440p": (2560, 1440),
+    "4k": (3840, 2160),
+    "5k": (5120, 2880),
+    "portrait": (1080, 1920),
+}
+
+def parse_size(text):
+    """Parse a size like "1920x1080" or a preset name like "4k" into (width, height)."""
+    text = text.strip().lower()
+    if text in SIZE_PRESETS:
+        return SIZE_PRESETS[text]
+    match = re.fullmatch(r"(\d+)x(\d+)", text)
+    if not match:
+        presets = ", ".join(SIZE_PRESETS)
+        raise ValueError(f"invalid size {text!r}: use WIDTHxHEIGHT or one of {presets}")
+    width, height = int(match.group(1)), int(match.group(2))
+    if width <= 0 or height <= 0:
+        raise ValueError(f"invalid size {text!r}: width and height must be positive")
+    return width, height
+
+# Maximum number of sizes whose layout is kept in memory
+LAYOUT_CACHE_SIZE = 64
+
+def format_size(size):
+    """Format (width, height) as "WIDTHxHEIGHT"."""
+    return f"{size[0]}x{size[1]}"
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def get_layout(width, height):
+    """Get the layout for an image size.
+
+    Returns a dict with the scaled BASE_LAYOUT values plus:
+    - scale: factor applied to the base values
+    - hero_box: (left, top, right, bottom) area for the character and romaji
+    - chart_x, chart_y, chart_width: reference chart origin and width
+    The dict is shared between calls; do not modify it.
+    """
+    portrait = height > width
+    if portrait:
+        # Compare against the base design turned on its side
+        scale = min(width / BASE_SIZE[1], height / BASE_SIZE[0])
+    else:
+        scale = min(width / BASE_SIZE[0], height / BASE_SIZE[1])
+
+    layout = {key: max(1, round(value * scale)) for key, value in BASE_LAYOUT.items()}
+    layout["scale"] = scale
+
+    margin = layout["chart_margin"]
+    if portrait:
+        # Character on the top half, chart below it
+        hero_height = int(height * 0.5)
+        layout["hero_box"] = (0, 0, width, hero_height)
+        layout["chart_x"] = layout["portrait_label_space"]
+        layout["chart_y"] = hero_height
+    else:
+        # Main content area (left 1/2 - smaller to give more space for reference chart)
+        main_width = int(width * 0.5)
+        layout["hero_box"] = (0, 0, main_width, height)
+        layout["chart_x"] = main_width + margin
+        layout["chart_y"] = layout["chart_top"]  # moved down significantly
+    layout["chart_width"] = width - layout["chart_x"] - margin
+
+    return layout
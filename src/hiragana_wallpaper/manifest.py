@@ -0,0 +1,96 @@
+"""
+Content-hash manifest for incremental wallpaper regeneration.
+
+The manifest lives in the output directory and maps each generated filename
+to a hash of everything that affects its pixels: the character entry, the
+colour scheme, the render settings, the font files and the generator version.
+Files whose hash is unchanged are skipped on the next run, and files that
+were generated before but are no longer produced are pruned.
+"""
+
+import hashlib
+import json
+import os
+from .data import COLORS
+from .fonts import font_fingerprint
+from .generator import GENERATOR_VERSION
+
+MANIFEST_FILENAME = ".hiragana-manifest.json"
+
+def render_key(character_data, **settings):
+    """Hash the inputs that determine one rendered wallpaper.
+
+    Extra keyword arguments (size, highlight, format...) are included as-is
+    and must be JSON serializable.
+    """
+    inputs = {
+        "entry": character_data,
+        "colors": COLORS,
+        "fonts": font_fingerprint(),
+        "version": GENERATOR_VERSION,
+        "settings": settings,
+    }
+    payload = json.dumps(inputs, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def load_manifest(output_dir):
+    """Load the manifest of an output directory ({} if missing or unreadable)."""
+    path = os.path.join(output_dir, MANIFEST_FILENAME)
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest.get("files", {})
+
+def save_manifest(output_dir, files):
+    """Atomically write the manifest for an output directory."""
+    path = os.path.join(output_dir, MANIFEST_FILENAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "files": files}, f, indent=2, sort_keys=True, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def plan_build(output_dir, wanted, force=False):
+    """Work out what an incremental build has to do.
+
+    wanted maps each output filename (relative to output_dir) to its render key. Returns
+    (to_render, to_prune): the filenames that are missing or out of date,
+    and the previously generated filenames that are no longer wanted.
+    """
+    previous = load_manifest(output_dir)
+    
+    to_render = [
+        filename for filename, key in wanted.items()
+        if force
+        or previous.get(filename) != key
+        or not os.path.exists(os.path.join(output_dir, filename))
+    ]
+    to_prune = [filename for filename in previous if filename not in wanted]
+    
+    return to_render, to_prune
+
+def prune_files(output_dir, filenames):
+    """Delete stale generated files, ignoring ones that are already gone.
+
+    Subdirectories left empty by the pruning (e.g. for a size that is no
+    longer generated) are removed as well.
+    """
+    emptied = set()
+    for filename in filenames:
+        # Only ever touch files inside the output directory
+        normalized = os.path.normpath(filename)
+        if os.path.isabs(normalized) or normalized.split(os.sep)[0] == os.pardir:
+            continue
+        try:
+            os.remove(os.path.join(output_dir, normalized))
+        except FileNotFoundError:
+            pass
+        if os.path.dirname(normalized):
+            emptied.add(os.path.dirname(normalized))
+    
+    for directory in emptied:
+        try:
+            os.rmdir(os.path.join(output_dir, directory))
+        except OSError:
+            pass  # still has other files in it
@@ -0,0 +1,195 @@
+"""
+Streaming generation API for the Hiragana Wallpaper Generator.
+
+Wallpapers are produced lazily, one at a time or from a pool of worker
+processes with a bounded look-ahead, so memory stays at a handful of image
+buffers however large the deck is.
+"""
+
+import itertools
+import os
+import time
+from collections import deque
+from typing import NamedTuple
+from .deck import DEFAULT_DECK, get_deck
+from .encoders import EncodeResult, encode_image, file_extension
+from .fonts import font_cache_info
+from .generator import generate_wallpaper, warm_caches
+from .glyphs import load_glyph_cache, glyph_cache_info
+from .layout import BASE_SIZE, format_size
+from . import profiling
+
+class RenderTask(NamedTuple):
+    """One wallpaper to render: fmt=None means return the image unencoded.
+
+    deck is a deck name or path (see deck.load_deck), so tasks stay cheap to
+    send to worker processes.
+    """
+    entry: dict
+    size: tuple = BASE_SIZE
+    fmt: str = None
+    preset: str = "default"
+    highlight: bool = False
+    theme: str = "plain"
+    deck: str = DEFAULT_DECK
+
+# Set in worker processes: their pid, and the stage events collected there,
+# sent back with each result
+_worker_pid = None
+_worker_events = None
+
+def init_worker(sizes, glyph_cache=None, profile=False, theme="plain", deck=DEFAULT_DECK):
+    """Load fonts, glyphs and the chart background once per worker process."""
+    global _worker_pid, _worker_events
+    _worker_pid = os.getpid()
+    if glyph_cache:
+        load_glyph_cache(glyph_cache)
+    for size in sizes:
+        warm_caches(size=size, theme=theme, deck=deck)
+    
+    # Hooks inherited from the parent cannot report back; collect instead
+    profiling.clear_hooks()
+    if profile:
+        _worker_events = []
+        profiling.add_hook(lambda event: _worker_events.append({**event, "pid": _worker_pid}))
+
+def cache_counts():
+    """Hits and misses of this process's font and glyph caches."""
+    fonts = font_cache_info()
+    glyphs = glyph_cache_info()
+    return {
+        "font": {"hits": fonts.hits, "misses": fonts.misses},
+        "glyph": {"hits": glyphs["hits"], "misses": glyphs["misses"]},
+    }
+
+def task_label(task):
+    """Name of a task in profiling output, e.g. "hiragana_a_あ@2880x1800"."""
+    return f"{get_deck(task.deck).name}_{task.entry['pronunciation']}_{task.entry['char']}@{format_size(task.size)}"
+
+def render_task(task):
+    """Render one task; returns (image or encoded bytes, encode seconds, worker report).
+
+    The report is None except in worker processes, where it carries the
+    worker's pid, its stage events since the last task and its cache counts.
+    """
+    with profiling.image(task_label(task)):
+        wallpaper = generate_wallpaper(task.entry, highlight=task.highlight, size=task.size,
+                                       theme=task.theme, deck=task.deck)
+        if task.fmt is None:
+            data, seconds = wallpaper, 0.0
+        else:
+            with profiling.stage("encode", format=task.fmt) as info:
+                start = time.perf_counter()
+                data = encode_image(wallpaper, task.fmt, task.preset)
+                seconds = time.perf_counter() - start
+                info["bytes"] = len(data)
+    
+    if _worker_pid is None:
+        return data, seconds, None
+    events = None
+    if _worker_events is not None:
+        events = list(_worker_events)
+        _worker_events.clear()
+    return data, seconds, {"pid": _worker_pid, "events": events, "caches": cache_counts()}
+
+def render_tasks(tasks, jobs=1, lookahead=None, glyph_cache=None, worker_caches=None):
+    """Render tasks lazily, yielding (task, result, encode seconds) in task order.
+
+    With jobs > 1 the tasks run in a process pool, and at most lookahead
+    (default: 2 * jobs) results are in flight or waiting to be consumed.
+    Closing the generator early cancels the remaining work. worker_caches,
+    if given, is a dict filled with each worker's cache_counts() by pid.
+    """
+    if jobs is None or jobs < 1:
+        jobs = os.cpu_count() or 1
+    if jobs == 1:
+        for task in tasks:
+            data, seconds, _ = render_task(task)
+            yield task, data, seconds
+        return
+
+    if lookahead is None:
+        lookahead = 2 * jobs
+    remaining = iter(tasks)
+    first = next(remaining, None)
+    if first is None:
+        return
+    remaining = itertools.chain([first], remaining)
+    
+    # Imported here so serial runs don't pay for multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    
+    # Workers warm up for the first task's size, theme and deck; others are cached on first use
+    executor = ProcessPoolExecutor(max_workers=jobs, initializer=init_worker,
+                                   initargs=([tuple(first.size)], glyph_cache,
+                                             profiling.hooks_enabled(), first.theme, first.deck))
+    try:
+        pending = deque()
+        
+        def submit_next():
+            task = next(remaining, None)
+            if task is not None:
+                pending.append((task, executor.submit(render_task, task)))
+        
+        for _ in range(lookahead):
+            submit_next()
+        while pending:
+            task, future = pending.popleft()
+            result, seconds, report = future.result()
+            for event in report["events"] or ():
+                profiling.emit(event)
+            if worker_caches is not None:
+                worker_caches[report["pid"]] = report["caches"]
+            # Keep the window full before handing the result to the caller
+            submit_next()
+            yield task, result, seconds
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+def iter_wallpapers(entries=None, size=BASE_SIZE, fmt=None, preset="default",
+                    highlight=False, jobs=1, lookahead=None, theme="plain", deck=DEFAULT_DECK):
+    """Yield (entry, wallpaper) for each entry, lazily and in order.
+
+    entries defaults to every entry of the deck. With fmt=None each wallpaper is a PIL
+    image; with a format name (see encoders.FORMATS) it is the encoded bytes,
+    which is cheaper to pass back from worker processes.
+    """
+    if entries is None:
+        entries = get_deck(deck).entries
+    tasks = (RenderTask(entry, tuple(size), fmt, preset, highlight, theme, deck) for entry in entries)
+    for task, wallpaper, _ in render_tasks(tasks, jobs, lookahead):
+        yield task.entry, wallpaper
+
+def default_filename(entry, fmt="png", deck=DEFAULT_DECK):
+    """Descriptive filename for an entry: <deck name>_<romaji>_<char>.<ext>, e.g. hiragana_ka_か.png."""
+    return f"{get_deck(deck).name}_{entry['pronunciation']}_{entry['char']}.{file_extension(fmt)}"
+
+def write_file(path, data):
+    """Write encoded bytes to path via a temporary file, so readers never see half a file."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def generate_all(output_dir, entries=None, size=BASE_SIZE, fmt="png", preset="default",
+                 highlight=False, jobs=1, lookahead=None, filename=None, theme="plain", deck=DEFAULT_DECK):
+    """Render entries and write each file as soon as it is ready.
+
+    entries defaults to every entry of the deck, and filename(entry, fmt) to
+    default_filename for the deck. Returns an EncodeResult (path, bytes,
+    encode seconds) per file.
+    """
+    if entries is None:
+        entries = get_deck(deck).entries
+    if filename is None:
+        filename = lambda entry, fmt: default_filename(entry, fmt, deck)
+    os.makedirs(output_dir, exist_ok=True)
+
+    results = []
+    tasks = (RenderTask(entry, tuple(size), fmt, preset, highlight, theme, deck) for entry in entries)
+    for task, data, seconds in render_tasks(tasks, jobs, lookahead):
+        path = os.path.join(output_dir, filename(task.entry, fmt))
+        with profiling.image(task_label(task)), profiling.stage("write", bytes=len(data)):
+            write_file(path, data)
+        results.append(EncodeResult(path, len(data), seconds))
+    return results
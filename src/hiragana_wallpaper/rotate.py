@@ -0,0 +1,274 @@
+"""
+Wallpaper rotation daemon.
+
+Shows one wallpaper after another at a fixed interval. The next character
+comes from an ordering (sequential, random or spaced repetition), and a
+background thread keeps the next few wallpapers rendered to files ahead of
+time, so a switch only hands a finished file to a setter: a symlink swap,
+a rename onto a fixed path, or a command such as feh or gsettings.
+
+Between switches the render thread waits on a condition and the main thread
+sleeps, so an idle rotation uses no CPU. At most ahead + 1 wallpaper files
+exist at a time, and memory is the generator's per-size caches.
+"""
+
+import itertools
+import os
+import random
+import re
+import shlex
+import subprocess
+import threading
+from .deck import DEFAULT_DECK, get_deck
+from .layout import BASE_SIZE
+from .pipeline import RenderTask, render_task, default_filename, write_file
+
+# Wallpapers rendered ahead of the one on screen
+DEFAULT_AHEAD = 3
+
+# Rendered files in the spool directory: <6-digit number>_<default filename>
+_SPOOL_NAME = re.compile(r"\d{6}_")
+
+# Spaced repetition: a kana in box b comes back after about 2 ** b other
+# wallpapers. The top box grows with the deck (see spaced_order).
+MAX_BOX = 5
+
+def sequential_order(entries, rng=None):
+    """Yield the entries in deck order, forever."""
+    while True:
+        yield from entries
+
+def random_order(entries, rng=None):
+    """Yield the entries shuffled, forever; every entry is shown once per pass."""
+    rng = rng or random.Random()
+    entries = list(entries)
+    previous = None
+    while True:
+        rng.shuffle(entries)
+        # Don't show the same wallpaper twice in a row across passes
+        if len(entries) > 1 and entries[0] is previous:
+            entries[0], entries[-1] = entries[-1], entries[0]
+        yield from entries
+        previous = entries[-1]
+
+def spaced_order(entries, rng=None):
+    """Yield entries by spaced repetition (Leitner boxes), forever.
+
+    Kana are introduced one at a time in deck order. Each time a kana is
+    shown it moves up a box, and a kana in box b is due again after 2 ** b
+    wallpapers, so a new kana comes back quickly and a familiar one rarely.
+    The most overdue kana is shown first (ties broken at random); when
+    nothing is due, the next new kana.
+
+    The top box is MAX_BOX, or higher for a deck of more than 2 ** MAX_BOX
+    kana: with a top interval shorter than the deck, a full rotation is
+    always overdue and the rest of the deck would never be introduced.
+    """
+    rng = rng or random.Random()
+    max_box = max(MAX_BOX, (len(entries) - 1).bit_length())
+    boxes = {}
+    last_shown = {}
+    unseen = iter(entries)
+    for step in itertools.count():
+        seen = [entry for entry in entries if entry["char"] in last_shown]
+        overdue = [step - last_shown[entry["char"]] - 2 ** boxes[entry["char"]] for entry in seen]
+        best = max(overdue, default=-1)
+        entry = None
+        if best < 0:
+            entry = next(unseen, None)
+        if entry is None:
+            entry = rng.choice([entry for entry, score in zip(seen, overdue) if score == best])
+        char = entry["char"]
+        last_shown[char] = step
+        boxes[char] = min(boxes.get(char, 0) + 1, max_box)
+        yield entry
+
+ORDERS = {
+    "sequential": sequential_order,
+    "random": random_order,
+    "spaced": spaced_order,
+}
+
+class SymlinkSetter:
+    """Point a symlink at the current wallpaper (swapped atomically)."""
+
+    keeps_file = True
+
+    def __init__(self, target):
+        self.target = target
+
+    def apply(self, path):
+        tmp_link = self.target + ".tmp"
+        if os.path.lexists(tmp_link):
+            os.remove(tmp_link)
+        os.symlink(os.path.abspath(path), tmp_link)
+        os.replace(tmp_link, self.target)
+
+class FileSetter:
+    """Move the current wallpaper onto a fixed path (an atomic rename)."""
+
+    keeps_file = False
+
+    def __init__(self, target):
+        self.target = target
+
+    def apply(self, path):
+        os.replace(path, self.target)
+
+class CommandSetter:
+    """Run a command for each wallpaper; {path} in it is replaced by the file's path."""
+
+    keeps_file = True
+
+    def __init__(self, command):
+        self.command = command
+
+    def apply(self, path):
+        args = [arg.replace("{path}", os.path.abspath(path)) for arg in shlex.split(self.command)]
+        subprocess.run(args, check=True)
+
+SETTERS = {
+    "symlink": SymlinkSetter,
+    "file": FileSetter,
+    "command": CommandSetter,
+}
+
+class Rotator:
+    """Renders upcoming wallpapers in a background thread and applies them on switch().
+
+    order is an iterator of deck entries (see ORDERS), and setter an object
+    with apply(path) (see SETTERS). Rendered files go to spool_dir; at most
+    ahead of them wait to be shown.
+    """
+
+    def __init__(self, order, setter, spool_dir, size=BASE_SIZE, fmt="png", preset="default",
+                 highlight=False, theme="plain", deck=DEFAULT_DECK, ahead=DEFAULT_AHEAD):
+        if ahead < 1:
+            raise ValueError("ahead must be at least 1")
+        self.order = order
+        self.setter = setter
+        self.spool_dir = spool_dir
+        self.size = tuple(size)
+        self.fmt = fmt
+        self.preset = preset
+        self.highlight = highlight
+        self.theme = theme
+        self.deck = deck
+        self.ahead = ahead
+        self.current = None
+        self._ready = []
+        self._error = None
+        self._stopping = False
+        self._rendered = 0
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start rendering ahead, after deleting files left by an earlier run."""
+        os.makedirs(self.spool_dir, exist_ok=True)
+        for name in os.listdir(self.spool_dir):
+            if _SPOOL_NAME.match(name):
+                _remove(os.path.join(self.spool_dir, name))
+        self._thread = threading.Thread(target=self._render_ahead, name="rotate-render", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the render thread and delete the wallpapers that were never shown."""
+        self._stop_event.set()
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        for _, path in self._ready:
+            _remove(path)
+        self._ready.clear()
+
+    def pending(self):
+        """Number of rendered wallpapers waiting to be shown."""
+        with self._condition:
+            return len(self._ready)
+
+    def _render_ahead(self):
+        while True:
+            with self._condition:
+                while len(self._ready) >= self.ahead and not self._stopping:
+                    self._condition.wait()
+                if self._stopping:
+                    return
+            try:
+                entry = next(self.order)
+                task = RenderTask(entry, self.size, self.fmt, self.preset, self.highlight, self.theme, self.deck)
+                data, _, _ = render_task(task)
+                self._rendered += 1
+                # Numbered so a wallpaper shown twice in the window gets two files
+                name = f"{self._rendered:06d}_{default_filename(entry, self.fmt, self.deck)}"
+                path = os.path.join(self.spool_dir, name)
+                write_file(path, data)
+            except Exception as e:
+                with self._condition:
+                    self._error = e
+                    self._condition.notify_all()
+                return
+            with self._condition:
+                self._ready.append((entry, path))
+                self._condition.notify_all()
+
+    def switch(self):
+        """Apply the next wallpaper and return its entry.
+
+        Only waits for a render when nothing is ready yet (at start-up, or
+        if the interval is shorter than a render).
+        """
+        with self._condition:
+            while not self._ready and self._error is None:
+                self._condition.wait()
+            if not self._ready:
+                raise self._error
+            entry, path = self._ready.pop(0)
+            self._condition.notify_all()
+
+        self.setter.apply(path)
+        if self.current is not None and self.current != path:
+            _remove(self.current)
+        self.current = path if self.setter.keeps_file else None
+        return entry
+
+    def run(self, interval, count=None, on_switch=None):
+        """Switch every interval seconds, count times (forever if None), until stop()."""
+        switches = 0
+        while count is None or switches < count:
+            entry = self.switch()
+            switches += 1
+            if on_switch is not None:
+                on_switch(entry)
+            if (count is None or switches < count) and self._stop_event.wait(interval):
+                break
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def rotate(setter, spool_dir, interval, order="sequential", count=None, seed=None, size=BASE_SIZE,
+           fmt="png", preset="default", highlight=False, theme="plain", deck=DEFAULT_DECK,
+           ahead=DEFAULT_AHEAD, on_switch=None):
+    """Rotate through a deck's wallpapers until interrupted (or count switches)."""
+    rng = random.Random(seed)
+    entries = get_deck(deck).entries
+    rotator = Rotator(ORDERS[order](entries, rng), setter, spool_dir, size, fmt, preset,
+                      highlight, theme, deck, ahead)
+    with rotator:
+        try:
+            rotator.run(interval, count, on_switch)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,220 @@
+"""
+On-demand wallpaper HTTP server.
+
+Serves GET /wallpaper/<romaji or kana>?w=&h=&fmt=&preset=&theme=&highlight=1 by
+rendering through the same pipeline as the CLI. Only a fixed list of sizes
+is served, since every size a worker renders keeps full-size layers in its
+caches. Rendering runs in a process pool, encoded images are kept in a
+bounded in-memory LRU, concurrent
+requests for the same image share one render, and responses carry an ETag
+derived from the render inputs so clients can revalidate with
+If-None-Match without anything being rendered.
+"""
+
+import json
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+from .deck import DEFAULT_DECK, get_deck
+from .encoders import PRESETS, available_formats, mime_type
+from .layout import BASE_SIZE, SIZE_PRESETS, format_size
+from .manifest import render_key
+from .pipeline import RenderTask, render_task, init_worker
+from .themes import available_themes, theme_key
+
+# Default memory budget for cached encoded images
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+
+# Sizes served unless others are given; the first is the default
+SERVE_SIZES = list(dict.fromkeys([BASE_SIZE, *SIZE_PRESETS.values()]))
+
+class ImageCache:
+    """Thread-safe LRU of encoded images, bounded by total bytes."""
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self._items.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._items.move_to_end(key)
+            return data
+
+    def put(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._items.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= len(previous)
+            self._items[key] = data
+            self.total_bytes += len(data)
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.total_bytes -= len(evicted)
+
+    def __len__(self):
+        return len(self._items)
+
+def _pool_context():
+    # Workers are started from request handler threads, and forking a
+    # multi-threaded process can deadlock the child
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+def etag_matches(if_none_match, etag):
+    """Whether an If-None-Match header matches etag (weak comparison, or "*")."""
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in [tag.removeprefix("W/") for tag in tags]
+
+def find_entry(name, deck=DEFAULT_DECK):
+    """Find a deck entry by kana or romaji (the first match for shared romaji like "ji")."""
+    return get_deck(deck).entry(name)
+
+class WallpaperServer(ThreadingHTTPServer):
+    """HTTP server with a render pool, an image cache and in-flight request sharing."""
+
+    daemon_threads = True
+
+    def __init__(self, address, jobs=None, cache_bytes=DEFAULT_CACHE_BYTES, deck=DEFAULT_DECK, sizes=None):
+        super().__init__(address, WallpaperRequestHandler)
+        self.deck = deck
+        self.sizes = [tuple(size) for size in sizes or SERVE_SIZES]
+        self.cache = ImageCache(cache_bytes)
+        self.executor = ProcessPoolExecutor(max_workers=jobs, mp_context=_pool_context(),
+                                            initializer=init_worker,
+                                            initargs=(self.sizes[:1], None, False, "plain", deck))
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+
+    def render(self, etag, task):
+        """Get encoded bytes for a task from the cache, a running render, or a new one."""
+        data = self.cache.get(etag)
+        if data is not None:
+            return data
+
+        with self._inflight_lock:
+            future = self._inflight.get(etag)
+            if future is None:
+                future = self.executor.submit(render_task, task)
+                self._inflight[etag] = future
+        try:
+            data, _, _ = future.result()
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(etag, None)
+        self.cache.put(etag, data)
+        return data
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(cancel_futures=True)
+
+class WallpaperRequestHandler(BaseHTTPRequestHandler):
+    """Handles /wallpaper/<name> and / (list of available characters)."""
+
+    server_version = "HiraganaWallpaper/1"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path in ("/", "/wallpapers"):
+            self._send_json([
+                {"char": entry["char"], "pronunciation": entry["pronunciation"], "meaning": entry["meaning"]}
+                for entry in get_deck(self.server.deck).entries
+            ])
+            return
+        if not url.path.startswith("/wallpaper/"):
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        entry = find_entry(unquote(url.path[len("/wallpaper/"):]), self.server.deck)
+        if entry is None:
+            self.send_error(HTTPStatus.NOT_FOUND, "Unknown character")
+            return
+        try:
+            task = self._parse_task(entry, parse_qs(url.query))
+        except ValueError as e:
+            self.send_error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+
+        etag = '"' + render_key(entry, size=list(task.size), highlight=task.highlight,
+                                format=task.fmt, preset=task.preset, theme=task.theme,
+                                theme_settings=theme_key(task.theme), deck=task.deck) + '"'
+        if etag_matches(self.headers.get("If-None-Match", ""), etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        try:
+            data = self.server.render(etag, task)
+        except Exception as e:
+            self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f"Rendering failed: {e}")
+            return
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", mime_type(task.fmt))
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "public, max-age=86400")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _parse_task(self, entry, query):
+        def value(name, default):
+            return query.get(name, [default])[-1]
+
+        default_width, default_height = self.server.sizes[0]
+        try:
+            size = (int(value("w", default_width)), int(value("h", default_height)))
+        except ValueError:
+            raise ValueError("w and h must be integers")
+        if size not in self.server.sizes:
+            sizes = ", ".join(format_size(size) for size in self.server.sizes)
+            raise ValueError(f"w and h must be one of the served sizes: {sizes}")
+
+        fmt = value("fmt", "png")
+        if fmt not in available_formats():
+            raise ValueError(f"fmt must be one of {', '.join(available_formats())}")
+        preset = value("preset", "default")
+        if preset not in PRESETS:
+            raise ValueError(f"preset must be one of {', '.join(PRESETS)}")
+        theme = value("theme", "plain")
+        if theme not in available_themes():
+            raise ValueError(f"theme must be one of {', '.join(available_themes())}")
+        highlight = value("highlight", "0") in ("1", "true", "yes")
+
+        return RenderTask(entry, size, fmt, preset, highlight, theme, self.server.deck)
+
+    def _send_json(self, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+def serve(host="127.0.0.1", port=8000, jobs=None, cache_bytes=DEFAULT_CACHE_BYTES, deck=DEFAULT_DECK,
+          sizes=None):
+    """Run the wallpaper server for a deck and sizes (default: SERVE_SIZES) until interrupted."""
+    server = WallpaperServer((host, port), jobs=jobs, cache_bytes=cache_bytes, deck=deck, sizes=sizes)
+    print(f"🌐 Serving wallpapers on http://{host}:{server.server_address[1]}/wallpaper/<romaji>")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,126 @@
+"""
+Colour themes for the Hiragana Wallpaper Generator.
+
+The "plain" theme is the original flat dark background and needs nothing
+beyond Pillow. The other themes add gradients, a vignette, a noise texture
+or per-group accent colours in the reference chart. Their backgrounds are
+composited with NumPy (an optional dependency, pip install
+hiragana-wallpaper[themes]) once per size and theme, so a richer theme costs
+no more per image than the plain one.
+"""
+
+import importlib.util
+import json
+from .data import COLORS
+
+# Theme settings:
+#   background, text_primary, text_secondary - as in COLORS
+#   background_end - bottom colour of a vertical gradient from background
+#   vignette       - how much the corners are darkened (0 to 1)
+#   noise          - strength of a monochrome noise texture, in 0-255 levels
+#   accents        - chart colours, one per consonant group of the deck
+THEMES = {
+    "plain": dict(COLORS),
+    "dusk": {
+        **COLORS,
+        "background": "#1a1a1a",
+        "background_end": "#252b3d",
+        "vignette": 0.35,
+    },
+    "paper": {
+        "background": "#f3eee4",
+        "background_end": "#e6dfd1",
+        "text_primary": "#2b2b2b",
+        "text_secondary": "#7a7368",
+        "noise": 6.0,
+    },
+    "groups": {
+        **COLORS,
+        "vignette": 0.25,
+        "accents": ["#ffffff", "#f28b82", "#fbbc04", "#fff475", "#ccff90", "#a7ffeb",
+                    "#cbf0f8", "#aecbfa", "#d7aefb", "#fdcfe8", "#e6c9a8"],
+    },
+}
+
+# Seed for the noise texture, so the same theme always renders the same pixels
+NOISE_SEED = 0
+
+def _numpy_available():
+    # Checked without importing NumPy, which is slow to import
+    return importlib.util.find_spec("numpy") is not None
+
+def needs_compositing(theme):
+    """Whether a theme goes beyond a flat background (and so needs NumPy)."""
+    return any(theme.get(key) for key in ("background_end", "vignette", "noise", "accents"))
+
+def available_themes():
+    """Return the theme names usable here (themes beyond plain need NumPy)."""
+    if _numpy_available():
+        return list(THEMES)
+    return [name for name, theme in THEMES.items() if not needs_compositing(theme)]
+
+def get_theme(theme=None):
+    """Resolve a theme name (or None for plain) to its settings dict."""
+    if theme is None:
+        return THEMES["plain"]
+    if isinstance(theme, dict):
+        return theme
+    if theme not in THEMES:
+        raise ValueError(f"Unknown theme '{theme}' (expected one of {', '.join(THEMES)})")
+    return THEMES[theme]
+
+def theme_key(theme):
+    """Hashable, stable identity of a theme's settings, for caches."""
+    return json.dumps(get_theme(theme), sort_keys=True)
+
+def _rgb(color):
+    from PIL import ImageColor
+    return ImageColor.getrgb(color)[:3]
+
+def compose_background(size, theme, chart_mask, bands=()):
+    """Composite a themed background with the reference chart blended in.
+
+    chart_mask is the chart's coverage ("L" image of the same size) and
+    bands is a list of (top, bottom, group) pixel rows of the chart; with
+    accents, the chart inside each band is drawn in its group's colour.
+    Returns an RGB image.
+    """
+    import numpy as np
+    from PIL import Image
+
+    width, height = size
+    theme = get_theme(theme)
+    top = np.array(_rgb(theme["background"]), dtype=np.float32)
+
+    # Vertical gradient as one column, broadcast across the width below
+    if theme.get("background_end"):
+        end = np.array(_rgb(theme["background_end"]), dtype=np.float32)
+        t = np.linspace(0.0, 1.0, height, dtype=np.float32)[:, None, None]
+        background = top + (end - top) * t
+    else:
+        background = np.broadcast_to(top, (height, 1, 3))
+
+    shade = np.ones((height, width, 1), dtype=np.float32)
+    if theme.get("vignette"):
+        y, x = np.ogrid[-1.0:1.0:height * 1j, -1.0:1.0:width * 1j]
+        distance = (x * x + y * y).astype(np.float32) / 2.0
+        shade *= (1.0 - theme["vignette"] * distance)[..., None]
+    image = background * shade
+
+    if theme.get("noise"):
+        rng = np.random.default_rng(NOISE_SEED)
+        image = image + rng.standard_normal((height, width, 1), dtype=np.float32) * theme["noise"]
+
+    # Chart colour per pixel row: accents by group band, else the primary colour
+    ink = np.empty((height, 1, 3), dtype=np.float32)
+    ink[:] = _rgb(theme["text_primary"])
+    accents = theme.get("accents")
+    if accents:
+        for band_top, band_bottom, group in bands:
+            ink[max(band_top, 0):max(band_bottom, 0)] = _rgb(accents[group % len(accents)])
+
+    alpha = np.asarray(chart_mask, dtype=np.float32)[..., None] * (1.0 / 255.0)
+    image = image + (ink - image) * alpha
+
+    pixels = np.clip(np.rint(image), 0, 255).astype(np.uint8)
+    return Image.fromarray(pixels, "RGB")
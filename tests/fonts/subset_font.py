@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Build tests/fonts/KanaTestGothic.ttf, the font the golden images are rendered with.
+
+It is IPAexGothic 004.01 cut down to printable ASCII and the Hiragana and
+Katakana blocks, renamed as the IPA Font License requires for a derived font
+(see README.md next to this script). The source font ships in the
+matplotlib-fontja package (matplotlib_fontja/fonts/ipaexg.ttf) and at
+https://moji.or.jp/ipafont/.
+
+To run this script (the output is deterministic for the same source and fontTools):
+uv run --with fonttools tests/fonts/subset_font.py path/to/ipaexg.ttf
+"""
+
+import argparse
+import os
+import sys
+
+FONT_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT = os.path.join(FONT_DIR, "KanaTestGothic.ttf")
+
+FAMILY = "KanaTestGothic"
+
+# Printable ASCII for romaji and labels, and the whole Hiragana and Katakana blocks
+UNICODES = list(range(0x20, 0x7F)) + list(range(0x3040, 0x3100))
+
+# Names that carry the original font's name; the copyright, version and license records are kept
+RENAMED = {
+    1: FAMILY,
+    3: f"{FAMILY} subset 004.01",
+    4: FAMILY,
+    6: FAMILY,
+}
+
+def subset_font(source, output=OUTPUT):
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+
+    # Keep the source's timestamps, so rebuilding gives the same file
+    font = TTFont(source, recalcTimestamp=False)
+    options = subset.Options()
+    options.name_IDs = ["*"]
+    options.name_languages = ["*"]
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=UNICODES)
+    subsetter.subset(font)
+
+    name = font["name"]
+    for record in list(name.names):
+        if record.nameID in RENAMED:
+            name.removeNames(nameID=record.nameID, platformID=record.platformID, langID=record.langID)
+    for name_id, value in RENAMED.items():
+        name.setName(value, name_id, 3, 1, 0x409)
+        name.setName(value, name_id, 1, 0, 0)
+    font.save(output)
+    return output
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the golden images' test font from IPAexGothic.")
+    parser.add_argument("source", help="path to ipaexg.ttf (IPAexGothic 004.01)")
+    parser.add_argument("-o", "--output", default=OUTPUT, help=f"where to write the font (default: {OUTPUT})")
+    args = parser.parse_args(argv)
+    path = subset_font(args.source, args.output)
+    print(f"✅ Wrote {path} ({os.path.getsize(path) // 1024} KB)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
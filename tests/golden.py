@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Golden-image harness for the wallpaper renderer.
+
+Renders every case (the whole hiragana deck with highlights, plus a
+wallpaper per theme and a few from the other decks) at 960x600, where the
+chart kana are 12 pixels, in worker processes and compares each against a
+reference PNG in tests/golden/. A few pixels may differ slightly (e.g.
+rounding in NumPy's compositing), but a moved glyph, a missing highlight or a
+colour change fails. For every failure an expected | actual | difference
+image is written to test_output/golden/.
+
+All text is rendered with the font shipped in tests/fonts/ (see its
+README), whatever fonts are installed. The references record its hash, and
+a missing or different font fails the comparison.
+
+To run this script:
+uv run tests/golden.py            # compare against the references
+uv run tests/golden.py --update   # re-render the references after an intended change
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+# Add the src directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from PIL import Image, ImageChops, ImageStat, features
+from hiragana_wallpaper.deck import get_deck
+from hiragana_wallpaper.encoders import to_palette
+from hiragana_wallpaper.fonts import FONT_FILE_ENV, clear_font_cache
+from hiragana_wallpaper.pipeline import RenderTask, render_tasks
+from hiragana_wallpaper.themes import THEMES, available_themes
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+INDEX_FILENAME = "index.json"
+DIFF_DIR = os.path.join("test_output", "golden")
+
+# The font every golden image is rendered with, for all text
+GOLDEN_FONT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts", "KanaTestGothic.ttf")
+
+# Large enough for readable chart kana (12 pixels), small enough to check
+# the whole set in a few seconds
+GOLDEN_SIZE = (960, 600)
+
+# A pixel counts as changed if a channel differs by more than this
+PIXEL_TOLERANCE = 32
+
+# Changed pixels allowed per image; a missing highlight changes about 190
+MAX_CHANGED_PIXELS = 16
+
+# Mean difference allowed per channel, in levels; catches colour drift
+# (e.g. a theme's gradient) that stays under PIXEL_TOLERANCE everywhere
+MAX_MEAN_DIFFERENCE = 0.25
+
+def font_signature():
+    """Hash of the golden font's contents, plus the rasterizer version.
+
+    Raises FileNotFoundError if the font is missing.
+    """
+    if not os.path.isfile(GOLDEN_FONT):
+        raise FileNotFoundError(f"the golden images' font is missing: {GOLDEN_FONT} (see tests/fonts/README.md)")
+    with open(GOLDEN_FONT, "rb") as f:
+        font = hashlib.sha256(f.read()).hexdigest()
+    return {"font": font, "freetype": features.version("freetype2")}
+
+@contextmanager
+def golden_fonts():
+    """Render all text with GOLDEN_FONT inside the block, in this process and its workers."""
+    font_signature()
+    saved = {variable: os.environ.get(variable) for variable in FONT_FILE_ENV.values()}
+    os.environ.update({variable: GOLDEN_FONT for variable in FONT_FILE_ENV.values()})
+    clear_font_cache()
+    try:
+        yield
+    finally:
+        for variable, value in saved.items():
+            if value is None:
+                os.environ.pop(variable, None)
+            else:
+                os.environ[variable] = value
+        clear_font_cache()
+
+def golden_cases():
+    """Return {name: RenderTask} for every reference image, including themes that need NumPy."""
+    cases = {}
+
+    def add(deck, entries, theme="plain"):
+        for index, entry in entries:
+            name = f"{deck}_{theme}_{index:02d}_{entry['pronunciation']}"
+            cases[name] = RenderTask(entry, GOLDEN_SIZE, None, "default", True, theme, deck)
+
+    hiragana = list(enumerate(get_deck("hiragana").entries))
+    add("hiragana", hiragana)
+    for theme in THEMES:
+        if theme != "plain":
+            add("hiragana", hiragana[1:2], theme)
+    for deck in ("katakana", "yoon"):
+        add(deck, list(enumerate(get_deck(deck).entries))[::15])
+    return cases
+
+def render_cases(cases, jobs=None):
+    """Render the cases in worker processes; yields (name, image).
+
+    Cases with a theme that cannot be rendered here (no NumPy) are left out.
+    """
+    themes = available_themes()
+    names = [name for name, task in cases.items() if task.theme in themes]
+    with golden_fonts():
+        results = render_tasks((cases[name] for name in names), jobs=jobs)
+        for name, (_, image, _) in zip(names, results):
+            yield name, image
+
+def compare_images(expected, actual):
+    """Return (changed pixels, largest difference, mean difference) between two images.
+
+    A pixel is changed if any channel differs by more than PIXEL_TOLERANCE;
+    the mean is the largest of the per-channel means.
+    """
+    if expected.size != actual.size:
+        return expected.size[0] * expected.size[1], 255, 255.0
+    difference = ImageChops.difference(expected.convert("RGB"), actual.convert("RGB"))
+    if difference.getbbox() is None:
+        return 0, 0, 0.0
+    # Largest difference over the channels, per pixel, counted with a histogram
+    red, green, blue = difference.split()
+    histogram = ImageChops.lighter(ImageChops.lighter(red, green), blue).histogram()
+    changed = sum(histogram[PIXEL_TOLERANCE + 1:])
+    largest = max(level for level, count in enumerate(histogram) if count)
+    return changed, largest, max(ImageStat.Stat(difference).mean)
+
+def save_diff(name, expected, actual):
+    """Write expected | actual | amplified difference side by side; returns the path."""
+    os.makedirs(DIFF_DIR, exist_ok=True)
+    width, height = actual.size
+    expected = expected.convert("RGB").resize(actual.size)
+    actual = actual.convert("RGB")
+    difference = ImageChops.difference(expected, actual).point(lambda level: min(255, level * 4))
+    sheet = Image.new("RGB", (width * 3, height))
+    for column, image in enumerate((expected, actual, difference)):
+        sheet.paste(image, (width * column, 0))
+    path = os.path.join(DIFF_DIR, f"{name}-diff.png")
+    sheet.save(path)
+    return path
+
+def load_index():
+    """Load tests/golden/index.json, or None if there are no references yet."""
+    try:
+        with open(os.path.join(GOLDEN_DIR, INDEX_FILENAME), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def update_goldens(jobs=None):
+    """Render every case and write the references and their index."""
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    for filename in os.listdir(GOLDEN_DIR):
+        if filename.endswith(".png"):
+            os.remove(os.path.join(GOLDEN_DIR, filename))
+    names = []
+    for name, image in render_cases(golden_cases(), jobs):
+        # Exact 8-bit where possible, which keeps the references small
+        to_palette(image).save(os.path.join(GOLDEN_DIR, f"{name}.png"), optimize=True)
+        names.append(name)
+    index = {"fonts": font_signature(), "size": list(GOLDEN_SIZE), "images": sorted(names)}
+    with open(os.path.join(GOLDEN_DIR, INDEX_FILENAME), "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    return len(names)
+
+def check_goldens(jobs=None):
+    """Compare every case with its reference.
+
+    Returns a list of (name, message) failures; missing and unexpected
+    references, and references made with another font, count as failures
+    too. Cases for themes that need NumPy are skipped without it. Raises
+    FileNotFoundError if the golden font is missing.
+    """
+    index = load_index()
+    if index is None:
+        return [("index", "no golden images; create them with --update")]
+    signature = font_signature()
+    if index["fonts"]["font"] != signature["font"]:
+        return [("index", f"the golden images were rendered with another font than {GOLDEN_FONT}; "
+                          "re-render them with --update")]
+    cases = golden_cases()
+    themes = available_themes()
+    failures = [(name, "no reference image") for name, task in cases.items()
+                if name not in index["images"] and task.theme in themes]
+    failures += [(name, "reference for a case that no longer exists")
+                 for name in index["images"] if name not in cases]
+
+    known = {name: task for name, task in cases.items() if name in index["images"]}
+    for name, actual in render_cases(known, jobs):
+        with Image.open(os.path.join(GOLDEN_DIR, f"{name}.png")) as expected:
+            expected.load()
+        changed, largest, mean = compare_images(expected, actual)
+        if changed > MAX_CHANGED_PIXELS or mean > MAX_MEAN_DIFFERENCE:
+            path = save_diff(name, expected, actual)
+            failures.append((name, f"{changed} pixels differ (up to {largest} levels, "
+                                   f"{mean:.2f} on average), see {path}"))
+    if failures and index["fonts"]["freetype"] != signature["freetype"]:
+        failures.append(("index", f"the golden images were rendered with FreeType {index['fonts']['freetype']}, "
+                                  f"this is FreeType {signature['freetype']}"))
+    return failures
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare rendered wallpapers with the golden images.")
+    parser.add_argument("--update", action="store_true", help="re-render the golden images")
+    parser.add_argument("-j", "--jobs", type=int, default=0,
+                        help="number of worker processes (0 = one per CPU, default: 0)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    start = time.perf_counter()
+    if args.update:
+        count = update_goldens(args.jobs or None)
+        if len(available_themes()) < len(THEMES):
+            print("⚠️  NumPy is not installed, so the themed references were not rendered")
+        print(f"✅ Wrote {count} golden images to {GOLDEN_DIR} ({time.perf_counter() - start:.1f}s)")
+        return 0
+
+    failures = check_goldens(args.jobs or None)
+    for name, message in failures:
+        print(f"❌ {name}: {message}")
+    if failures:
+        return 1
+    print(f"✅ All {len(load_index()['images'])} golden images match ({time.perf_counter() - start:.1f}s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Tests for single-file deck archives.
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import zipfile
+
+# Add the src directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from hiragana_wallpaper import HIRAGANA_DATA
+from hiragana_wallpaper.archive import ArchiveReader, ArchiveWriter, archive_format, export_archive
+from hiragana_wallpaper.pipeline import iter_wallpapers
+
+SIZE = (320, 200)
+ENTRIES = HIRAGANA_DATA[:4]
+
+class TestArchive(unittest.TestCase):
+    """Test cases for writing and memory-mapped reading of archives."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.expected = {entry["char"]: data for entry, data in iter_wallpapers(ENTRIES, size=SIZE, fmt="png")}
+
+    def _roundtrip(self, filename):
+        path = os.path.join(self.tmp.name, filename)
+        results = export_archive(path, ENTRIES, size=SIZE)
+        self.assertEqual(len(results), len(ENTRIES))
+        self.assertFalse(os.path.exists(path + ".tmp"))
+
+        with ArchiveReader(path) as reader:
+            self.assertEqual(len(reader), len(ENTRIES))
+            self.assertEqual(reader.names(), [result.path for result in results])
+            for entry, result in zip(ENTRIES, results):
+                self.assertEqual(reader.read(result.path), self.expected[entry["char"]])
+            image = reader.open_image(results[2].path)
+            self.assertEqual(image.size, SIZE)
+        return path
+
+    def test_zip_archive(self):
+        """Test that a ZIP archive has stored entries that standard tools can read."""
+        path = self._roundtrip("deck.zip")
+        with zipfile.ZipFile(path) as archive:
+            infos = archive.infolist()
+            self.assertTrue(all(info.compress_type == zipfile.ZIP_STORED for info in infos))
+            self.assertEqual(archive.read(infos[0]), self.expected[ENTRIES[0]["char"]])
+
+    def test_pack_archive(self):
+        """Test that a .hwpack archive round-trips every wallpaper."""
+        self._roundtrip("deck.hwpack")
+
+    def test_several_sizes_and_callbacks(self):
+        """Test that each entry is written at every size, named and reported by the callbacks."""
+        path = os.path.join(self.tmp.name, "deck.zip")
+        sizes = [SIZE, (200, 320)]
+        progress = []
+        results = export_archive(path, ENTRIES[:2], sizes=sizes,
+                                 filename=lambda entry, size, fmt: f"{size[0]}x{size[1]}/{entry['pronunciation']}.{fmt}",
+                                 on_result=lambda result, done, total: progress.append((result.path, done, total)))
+        names = [f"{width}x{height}/{entry['pronunciation']}.png" for entry in ENTRIES[:2] for width, height in sizes]
+        self.assertEqual([result.path for result in results], names)
+        self.assertEqual(progress, [(name, done, 4) for done, name in enumerate(names, 1)])
+        with ArchiveReader(path) as reader:
+            self.assertEqual(reader.open_image(names[1]).size, (200, 320))
+
+    def test_failed_write_leaves_no_archive(self):
+        """Test that an error while writing discards the partial archive."""
+        path = os.path.join(self.tmp.name, "deck.hwpack")
+        with self.assertRaises(RuntimeError):
+            with ArchiveWriter(path) as writer:
+                writer.add("a.png", b"data")
+                raise RuntimeError("interrupted")
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+    def test_unknown_extension(self):
+        """Test that only .zip and .hwpack archives are accepted."""
+        self.assertEqual(archive_format("deck.ZIP"), "zip")
+        with self.assertRaises(ValueError):
+            archive_format("deck.tar")
+
+if __name__ == '__main__':
+    unittest.main()
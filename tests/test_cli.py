@@ -0,0 +1,135 @@
+"""
+Tests for the command-line interface.
+"""
+
+import unittest
+import contextlib
+import io
+import os
+import sys
+import tempfile
+from unittest import mock
+
+# Add the src directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from hiragana_wallpaper.cli import main, parse_args
+from hiragana_wallpaper.deck import load_deck
+from hiragana_wallpaper.pipeline import default_filename
+from hiragana_wallpaper.themes import THEMES
+
+ARGV = ["--deck", "yoon", "--sizes", "480x300", "--report"]
+
+class TestCli(unittest.TestCase):
+    """Test cases for argument checking and parallel generation."""
+    
+    def _run(self, argv):
+        """Run the CLI in a scratch directory; returns ({filename: bytes}, report lines)."""
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                output = io.StringIO()
+                with contextlib.redirect_stdout(output):
+                    main(argv)
+                folder = os.path.join(tmp, "yoon_wallpapers")
+                files = {}
+                for filename in sorted(os.listdir(folder)):
+                    if filename.endswith(".png"):
+                        with open(os.path.join(folder, filename), "rb") as f:
+                            files[filename] = f.read()
+            finally:
+                os.chdir(cwd)
+        report = [line.split(":")[0] for line in output.getvalue().splitlines() if line.endswith(" ms")]
+        return files, report
+    
+    def test_profile_char_with_archive(self):
+        """Test that --profile-char also profiles when writing an --archive."""
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                with mock.patch("hiragana_wallpaper.cli.profile_character") as profile_character, \
+                        contextlib.redirect_stdout(io.StringIO()):
+                    main(ARGV + ["--archive", "deck.zip", "--profile-char", "kya"])
+                self.assertTrue(os.path.exists("deck.zip"))
+            finally:
+                os.chdir(cwd)
+        profile_character.assert_called_once()
+        self.assertEqual(profile_character.call_args.args[:2], ("kya", (480, 300)))
+    
+    def test_cache_counts_and_glyph_cache_with_workers(self):
+        """Test that workers' cache counts are reported and the glyph cache is saved on every path."""
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                argv = ARGV + ["--jobs", "2", "--glyph-cache", "glyphs.cache"]
+                output = io.StringIO()
+                with contextlib.redirect_stdout(output):
+                    main(argv)
+                self.assertTrue(os.path.exists("glyphs.cache"))
+                self.assertRegex(output.getvalue(), r"Font cache: \d+ hits, [1-9]\d* misses \(this process and \d+ workers\)")
+                
+                # One stale file is rendered in this process, which saves the glyph cache too
+                os.remove("glyphs.cache")
+                os.remove(os.path.join("yoon_wallpapers", default_filename(load_deck("yoon").entries[0], deck="yoon")))
+                output = io.StringIO()
+                with contextlib.redirect_stdout(output):
+                    main(argv)
+                self.assertIn("Generated 1 wallpapers", output.getvalue())
+                self.assertIn("Glyph cache:", output.getvalue())
+                self.assertTrue(os.path.exists("glyphs.cache"))
+            finally:
+                os.chdir(cwd)
+    
+    def test_negative_jobs_rejected(self):
+        """Test that --jobs below 0 is an argument error."""
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            parse_args(["--jobs", "-1"])
+        self.assertEqual(parse_args(["--jobs", "0"]).jobs, 0)
+    
+    def test_serve_uses_every_cpu_by_default(self):
+        """Test that --serve gets one worker per CPU unless --jobs is given."""
+        with mock.patch("hiragana_wallpaper.server.serve") as serve:
+            main(["--serve"])
+            main(["--serve", "--jobs", "2"])
+        self.assertEqual([call.kwargs["jobs"] for call in serve.call_args_list], [os.cpu_count(), 2])
+    
+    def test_serve_sizes(self):
+        """Test that --sizes with --serve lists the served sizes, and that --serve has its own default."""
+        with mock.patch("hiragana_wallpaper.server.serve") as serve:
+            main(["--serve"])
+            main(["--serve", "--sizes", "1080p,640x400"])
+        self.assertEqual([call.kwargs["sizes"] for call in serve.call_args_list],
+                         [None, [(1920, 1080), (640, 400)]])
+    
+    def test_theme_changes_rerender(self):
+        """Test that editing a theme's settings makes its wallpapers out of date."""
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    main(ARGV)
+                    main(ARGV)
+                    with mock.patch.dict(THEMES["plain"], {"text_secondary": "#808080"}):
+                        output = io.StringIO()
+                        with contextlib.redirect_stdout(output):
+                            main(ARGV)
+            finally:
+                os.chdir(cwd)
+        self.assertIn("Generated 33 wallpapers", output.getvalue())
+    
+    def test_parallel_matches_serial(self):
+        """Test that --jobs 2 writes the same files, in deck order, as a serial run."""
+        serial_files, serial_report = self._run(ARGV + ["--jobs", "1"])
+        parallel_files, parallel_report = self._run(ARGV + ["--jobs", "2"])
+        
+        self.assertEqual(len(serial_files), 33)
+        self.assertEqual(parallel_files, serial_files)
+        self.assertEqual(parallel_report, serial_report)
+        self.assertEqual(parallel_report, [default_filename(entry, deck="yoon") for entry in load_deck("yoon").entries])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Tests for character decks.
+"""
+
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+# Add the src directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from hiragana_wallpaper import HIRAGANA_DATA, generate_wallpaper
+from hiragana_wallpaper import data
+from hiragana_wallpaper.data import HIRAGANA_CHART_DATA
+from hiragana_wallpaper.deck import available_decks, get_deck, load_deck
+from hiragana_wallpaper.generator import chart_cell_positions, get_chart_fonts, _chart_geometry
+from hiragana_wallpaper.pipeline import RenderTask, task_label
+
+class TestDeck(unittest.TestCase):
+    """Test cases for deck loading and lookups."""
+
+    def test_hiragana_deck_is_the_character_data(self):
+        """Test that the built-in deck provides HIRAGANA_DATA and HIRAGANA_CHART_DATA."""
+        deck = load_deck("hiragana")
+        self.assertIs(deck.entries, HIRAGANA_DATA)
+        self.assertEqual(len(deck), 71)
+        self.assertEqual([entry["char"] for entry in HIRAGANA_DATA[:7]], list("あいうえおかが"))
+        self.assertEqual([entry["char"] for entry in HIRAGANA_CHART_DATA["ha"]], list("はばぱ"))
+        self.assertIn({"char": "ん", "pronunciation": "n", "meaning": "what"}, HIRAGANA_CHART_DATA["n"])
+        self.assertIs(data.HIRAGANA_CHART_DATA, data.HIRAGANA_CHART_DATA)
+
+    def test_lookups(self):
+        """Test lookups by character, romaji and chart position."""
+        deck = get_deck()
+        self.assertEqual(deck.by_char("か").pronunciation, "ka")
+        self.assertEqual(deck.by_romaji("ji").char, "じ")
+        self.assertEqual(deck.at(0, 0).char, "あ")
+        self.assertEqual(deck.at(2, 1).char, "ぎ")
+        self.assertIsNone(deck.at(12, 1))  # no "yi"
+        self.assertEqual(deck.entry("ぢ")["meaning"], "ground")
+        self.assertIsNone(deck.lookup("xyz"))
+
+    def test_groups_share_voiced_variants(self):
+        """Test that voiced kana belong to their base kana's group."""
+        deck = get_deck()
+        self.assertEqual(deck.by_char("か").group, deck.by_char("が").group)
+        self.assertNotEqual(deck.by_char("な").group, deck.by_char("ん").group)
+        self.assertEqual(deck.groups[0], "vowels")
+
+    def test_builtin_decks(self):
+        """Test that every built-in deck loads and draws one chart cell per kana."""
+        size = (960, 600)
+        font_jp, _ = get_chart_fonts(size)
+        self.assertIn("katakana", available_decks())
+        for name in available_decks():
+            deck = load_deck(name)
+            positions = chart_cell_positions(*_chart_geometry(*size), font_jp, deck=deck)
+            self.assertEqual(sorted(char for char, _ in positions), sorted(record.char for record in deck))
+
+    def test_task_label_names_the_deck(self):
+        """Test that profiling labels use the task's deck name."""
+        record = load_deck("katakana").by_romaji("ka")
+        task = RenderTask(record.as_dict(), (480, 300), deck="katakana")
+        self.assertEqual(task_label(task), "katakana_ka_カ@480x300")
+    
+    def test_deck_file(self):
+        """Test loading a deck from a file and rendering its wallpapers."""
+        data = {
+            "name": "tiny",
+            "columns": ["A", "I"],
+            "rows": [{"label": "K", "kana": [["カ", "ka", ""], None]}],
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tiny.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            deck = load_deck(path)
+            self.assertEqual(deck.entries, [{"char": "カ", "pronunciation": "ka", "meaning": ""}])
+            wallpaper = generate_wallpaper(deck.entries[0], highlight=True, size=(480, 300), deck=path)
+            self.assertEqual(wallpaper.size, (480, 300))
+
+        with self.assertRaises(ValueError):
+            load_deck("no-such-deck")
+    
+    def test_empty_chart_row_rejected(self):
+        """Test that a chart row without any kana is a clear error, not a failure while drawing."""
+        data = {
+            "name": "gappy",
+            "columns": ["A", "I"],
+            "rows": [{"label": "K", "kana": [["カ", "ka", ""], None]}, {"label": "X", "kana": [None, None]}],
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "gappy.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            with self.assertRaisesRegex(ValueError, "'X'.*no kana"):
+                load_deck(path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Tests for dirty-region rendering.
+"""
+
+import unittest
+import os
+import sys
+from unittest import mock
+
+# Add the src directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from PIL import ImageChops
+from hiragana_wallpaper import HIRAGANA_DATA, generate_wallpaper
+from hiragana_wallpaper.diffrender import DiffRenderer
+
+SIZE = (960, 600)
+
+def outside(image, rects):
+    """Copy of image with the rects blacked out."""
+    image = image.copy()
+    for rect in rects:
+        image.paste((0, 0, 0), rect)
+    return image
+
+class TestDiffRenderer(unittest.TestCase):
+    """Test cases for DiffRenderer."""
+    
+    def test_matches_generate_wallpaper(self):
+        """Test that each render has exactly generate_wallpaper's pixels, in one reused canvas."""
+        renderer = DiffRenderer(SIZE, highlight=True)
+        canvas = renderer.canvas
+        for entry in HIRAGANA_DATA[:8] + HIRAGANA_DATA[-3:]:
+            image, _ = renderer.render(entry)
+            self.assertIs(image, canvas)
+            expected = generate_wallpaper(entry, highlight=True, size=SIZE)
+            self.assertIsNone(ImageChops.difference(image, expected).getbbox(), entry["char"])
+    
+    def test_dirty_rects_cover_changes(self):
+        """Test that no pixel outside the dirty rects changes between renders."""
+        renderer = DiffRenderer(SIZE, highlight=True)
+        _, rects = renderer.render(HIRAGANA_DATA[0])
+        self.assertEqual(rects, [(0, 0, *SIZE)])
+        
+        previous = renderer.canvas.copy()
+        for entry in HIRAGANA_DATA[1:6]:
+            image, rects = renderer.render(entry)
+            self.assertTrue(rects)
+            self.assertLess(sum((r[2] - r[0]) * (r[3] - r[1]) for r in rects), SIZE[0] * SIZE[1] // 10)
+            difference = ImageChops.difference(outside(previous, rects), outside(image, rects))
+            self.assertIsNone(difference.getbbox(), entry["char"])
+            previous = image.copy()
+    
+    def test_no_image_allocation_when_warm(self):
+        """Test that once glyphs and patches are cached, rendering creates no images."""
+        renderer = DiffRenderer(SIZE, highlight=True)
+        entries = HIRAGANA_DATA[:10]
+        for entry in entries:
+            renderer.render(entry)
+        
+        allocating = ["new", "Image.crop", "Image.copy", "Image.convert", "Image._new"]
+        patches = [mock.patch(f"PIL.Image.{name}", side_effect=AssertionError(name)) for name in allocating]
+        for patch in patches:
+            patch.start()
+        try:
+            for entry in entries:
+                renderer.render(entry)
+        finally:
+            for patch in patches:
+                patch.stop()
+        self.assertIsNone(ImageChops.difference(renderer.canvas, generate_wallpaper(
+            entries[-1], highlight=True, size=SIZE)).getbbox())
+    
+    def test_reset(self):
+        """Test that reset restores the bare background and marks everything dirty."""
+        renderer = DiffRenderer(SIZE)
+        renderer.render(HIRAGANA_DATA[0])
+        renderer.reset()
+        self.assertIsNone(ImageChops.difference(renderer.canvas, renderer.base).getbbox())
+        self.assertEqual(renderer.render(HIRAGANA_DATA[1])[1], [(0, 0, *SIZE)])
+
+if __name__ == '__main__':
+    unittest.main()
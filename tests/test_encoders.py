@@ -0,0 +1,76 @@
+"""
+Tests for the output format and encoder presets.
+"""
+
+import unittest
+import io
+import os
+import sys
+import tempfile
+
+# Add the src directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from PIL import Image
+from hiragana_wallpaper import HIRAGANA_DATA, generate_wallpaper
+from hiragana_wallpaper.encoders import (
+    PRESETS, available_formats, encode_image, save_image, to_palette
+)
+from hiragana_wallpaper.themes import available_themes
+
+class TestEncoders(unittest.TestCase):
+    """Test cases for encoding wallpapers."""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.wallpaper = generate_wallpaper(HIRAGANA_DATA[0], size=(960, 600))
+    
+    def test_every_format_and_preset_decodes(self):
+        """Test that all formats and presets produce readable images."""
+        for fmt in available_formats():
+            for preset in PRESETS:
+                data = encode_image(self.wallpaper, fmt, preset)
+                with Image.open(io.BytesIO(data)) as decoded:
+                    self.assertEqual(decoded.size, self.wallpaper.size, (fmt, preset))
+    
+    def test_png8_is_lossless(self):
+        """Test that the 8-bit PNG keeps every pixel of the wallpaper."""
+        data = encode_image(self.wallpaper, "png8", "fast")
+        with Image.open(io.BytesIO(data)) as decoded:
+            self.assertEqual(decoded.convert("RGB").tobytes(), self.wallpaper.tobytes())
+    
+    @unittest.skipUnless("paper" in available_themes(), "themes need NumPy")
+    def test_png8_is_lossless_for_themes(self):
+        """Test that themed wallpapers with more than 256 colours stay exact in png8."""
+        for theme in ("paper", "dusk"):
+            wallpaper = generate_wallpaper(HIRAGANA_DATA[0], size=(960, 600), theme=theme)
+            self.assertIsNone(wallpaper.getcolors(256))
+            with Image.open(io.BytesIO(encode_image(wallpaper, "png8", "fast"))) as decoded:
+                self.assertEqual(decoded.mode, "RGB")
+                self.assertEqual(decoded.tobytes(), wallpaper.tobytes(), theme)
+    
+    def test_to_palette_for_coloured_images(self):
+        """Test that images with colour are reduced to a palette image."""
+        img = Image.new("RGB", (4, 4), "#1a1a1a")
+        img.putpixel((0, 0), (200, 40, 40))
+        palette = to_palette(img)
+        self.assertEqual(palette.mode, "P")
+        self.assertEqual(palette.convert("RGB").tobytes(), img.tobytes())
+    
+    def test_save_image_reports_size_and_time(self):
+        """Test that saving reports the bytes written and encode time."""
+        with tempfile.TemporaryDirectory() as output_dir:
+            path = os.path.join(output_dir, "wallpaper.png")
+            result = save_image(self.wallpaper, path, "png", "small")
+            self.assertEqual(result.bytes, os.path.getsize(path))
+            self.assertGreater(result.seconds, 0)
+    
+    def test_unknown_format_or_preset(self):
+        """Test that invalid formats and presets are rejected."""
+        with self.assertRaises(ValueError):
+            encode_image(self.wallpaper, "gif")
+        with self.assertRaises(ValueError):
+            encode_image(self.wallpaper, "png", "tiny")
+
+if __name__ == '__main__':
+    unittest.main()
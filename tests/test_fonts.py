@@ -0,0 +1,81 @@
+"""
+Tests for font discovery and caching.
+"""
+
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+
+# Add the src directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from hiragana_wallpaper import HIRAGANA_DATA, generate_wallpaper
+from hiragana_wallpaper.fonts import (
+    get_font, font_cache_info, clear_font_cache, find_font, FONT_PATH_ENV, FONT_FILE_ENV
+)
+
+TEST_FONT = os.path.join(os.path.dirname(__file__), "fonts", "KanaTestGothic.ttf")
+
+class TestFonts(unittest.TestCase):
+    """Test cases for the shared font cache."""
+    
+    def setUp(self):
+        clear_font_cache()
+    
+    def tearDown(self):
+        os.environ.pop(FONT_PATH_ENV, None)
+        for variable in FONT_FILE_ENV.values():
+            os.environ.pop(variable, None)
+        clear_font_cache()
+    
+    def test_same_font_is_reused(self):
+        """Test that the same (role, size) returns the cached face."""
+        first = get_font("japanese", 36)
+        second = get_font("japanese", 36)
+        self.assertIs(first, second)
+        
+        info = font_cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 1)
+    
+    def test_fonts_loaded_once_per_run(self):
+        """Test that generating several wallpapers only loads each face once."""
+        for character_data in HIRAGANA_DATA[:3]:
+            generate_wallpaper(character_data)
+        
+        # Hero character, romaji, chart kana and chart labels
+        self.assertEqual(font_cache_info().misses, 4)
+        self.assertGreater(font_cache_info().hits, 0)
+    
+    def test_search_path_from_environment(self):
+        """Test that HIRAGANA_FONT_PATH directories are searched."""
+        path, index = find_font("english")
+        if path is None:
+            self.skipTest("no english font installed")
+        
+        with tempfile.TemporaryDirectory() as font_dir:
+            copy = os.path.join(font_dir, os.path.basename(path))
+            shutil.copyfile(path, copy)
+            
+            os.environ[FONT_PATH_ENV] = font_dir
+            clear_font_cache()
+            self.assertEqual(find_font("english"), (copy, index))
+
+    def test_font_file_from_environment(self):
+        """Test that a font file named in the environment is used for its role only."""
+        os.environ[FONT_FILE_ENV["japanese"]] = TEST_FONT
+        clear_font_cache()
+        self.assertEqual(find_font("japanese"), (TEST_FONT, 0))
+        self.assertNotEqual(find_font("english")[0], TEST_FONT)
+    
+    def test_missing_font_file_from_environment(self):
+        """Test that a font file named in the environment must exist."""
+        os.environ[FONT_FILE_ENV["english"]] = os.path.join(os.path.dirname(TEST_FONT), "missing.ttf")
+        clear_font_cache()
+        with self.assertRaises(FileNotFoundError):
+            find_font("english")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,7 +10,11 @@ import shutil
 # Add the src directory to the path so we can import our modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from hiragana_wallpaper import HIRAGANA_DATA, generate_wallpaper, create_output_directory
+from PIL import Image, ImageChops, ImageDraw
+from hiragana_wallpaper import HIRAGANA_DATA, COLORS, generate_wallpaper, create_output_directory
+from hiragana_wallpaper.generator import (
+    draw_reference_chart, get_background, get_chart_layer, _chart_geometry
+)
 
 class TestGenerator(unittest.TestCase):
     """Test cases for wallpaper generation."""
@@ -67,5 +71,33 @@ class TestGenerator(unittest.TestCase):
             self.assertIn(key, first_char)
             self.assertIsInstance(first_char[key], str)
 
+class TestChartLayer(unittest.TestCase):
+    """Test cases for the pre-rendered reference chart."""
+    
+    def test_background_is_cached(self):
+        """Test that the static background is rendered once and shared."""
+        self.assertIs(get_background(), get_background())
+        self.assertIs(get_chart_layer(), get_chart_layer())
+    
+    def test_cached_chart_matches_direct_drawing(self):
+        """Test that pasting the chart layer gives the same pixels as drawing it."""
+        size = (2880, 1800)
+        img = Image.new('RGB', size, COLORS["background"])
+        draw_reference_chart(ImageDraw.Draw(img), *_chart_geometry(*size))
+        
+        self.assertIsNone(ImageChops.difference(img, get_background(size)).getbbox())
+    
+    def test_highlight_only_touches_chart_cell(self):
+        """Test that highlighting overlays a small patch inside the chart."""
+        test_char = HIRAGANA_DATA[0]
+        plain = generate_wallpaper(test_char)
+        highlighted = generate_wallpaper(test_char, highlight=True)
+        
+        bbox = ImageChops.difference(plain, highlighted).getbbox()
+        self.assertIsNotNone(bbox)
+        chart_start_x = _chart_geometry(*plain.size)[0]
+        self.assertGreater(bbox[0], chart_start_x)
+        self.assertLess((bbox[2] - bbox[0]) * (bbox[3] - bbox[1]), 100 * 100)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,87 @@
+"""
+Tests for the glyph mask cache.
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+
+# Add the src directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from PIL import Image, ImageChops, ImageDraw
+from hiragana_wallpaper.fonts import get_font
+from hiragana_wallpaper.glyphs import (
+    draw_glyph, get_glyph, glyph_cache_info, clear_glyph_cache,
+    save_glyph_cache, load_glyph_cache
+)
+
+class TestGlyphs(unittest.TestCase):
+    """Test cases for cached glyph rendering."""
+    
+    def setUp(self):
+        clear_glyph_cache()
+        self.font = get_font("english", 36)
+    
+    def tearDown(self):
+        clear_glyph_cache()
+    
+    def test_matches_imagedraw(self):
+        """Test that pasting a cached glyph gives the same pixels as ImageDraw.text."""
+        for xy in [(10, 10), (20.4, 15), (33.65, 12.5)]:
+            expected = Image.new("RGB", (120, 80), "#1a1a1a")
+            ImageDraw.Draw(expected).text(xy, "ka", font=self.font, fill="#ffffff")
+            
+            actual = Image.new("RGB", (120, 80), "#1a1a1a")
+            box = draw_glyph(actual, xy, "ka", self.font, "#ffffff")
+            
+            self.assertIsNone(ImageChops.difference(expected, actual).getbbox(), xy)
+            # The returned box covers every changed pixel
+            blank = Image.new("RGB", (120, 80), "#1a1a1a")
+            left, top, right, bottom = ImageChops.difference(expected, blank).getbbox()
+            self.assertTrue(box[0] <= left and box[1] <= top and right <= box[2] and bottom <= box[3], xy)
+    
+    def test_glyphs_are_cached(self):
+        """Test that the same text is rasterized only once."""
+        img = Image.new("L", (100, 100))
+        for _ in range(3):
+            draw_glyph(img, (5, 5), "A", self.font, 255)
+        self.assertEqual(glyph_cache_info()["misses"], 1)
+        self.assertEqual(glyph_cache_info()["hits"], 2)
+    
+    def test_text_without_ink(self):
+        """Test that blank text has no mask and draws nothing."""
+        mask, _, _ = get_glyph(" ", self.font)
+        self.assertIsNone(mask)
+        img = Image.new("L", (50, 50))
+        self.assertIsNone(draw_glyph(img, (5, 5), " ", self.font, 255))
+        self.assertIsNone(img.getbbox())
+    
+    def test_save_and_load(self):
+        """Test that glyphs survive a round trip through the cache file."""
+        original = get_glyph("Hi", self.font, (0.5, 0.0))
+        get_glyph(" ", self.font)
+        
+        with tempfile.TemporaryDirectory() as cache_dir:
+            path = os.path.join(cache_dir, "glyphs.cache")
+            save_glyph_cache(path)
+            clear_glyph_cache()
+            
+            self.assertEqual(load_glyph_cache(path), 2)
+            loaded = get_glyph("Hi", self.font, (0.5, 0.0))
+            self.assertEqual(glyph_cache_info()["misses"], 0)
+            self.assertEqual(loaded[0].tobytes(), original[0].tobytes())
+            self.assertEqual(loaded[1:], original[1:])
+    
+    def test_missing_or_corrupt_file(self):
+        """Test that unusable cache files are ignored."""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            path = os.path.join(cache_dir, "glyphs.cache")
+            self.assertEqual(load_glyph_cache(path), 0)
+            with open(path, "wb") as f:
+                f.write(b"garbage")
+            self.assertEqual(load_glyph_cache(path), 0)
+
+if __name__ == '__main__':
+    unittest.main()
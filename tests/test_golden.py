@@ -0,0 +1,78 @@
+"""
+Golden-image regression tests: rendered wallpapers against stored references.
+"""
+
+import unittest
+import os
+import random
+import sys
+from unittest import mock
+
+# Add the src directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from PIL import Image, ImageChops
+from hiragana_wallpaper import HIRAGANA_DATA, generate_wallpaper
+import golden
+
+class TestGolden(unittest.TestCase):
+    """Test cases for the golden-image harness."""
+    
+    def test_wallpapers_match_golden_images(self):
+        """Test that every golden case renders like its reference (see tests/golden.py)."""
+        failures = golden.check_goldens()
+        self.assertEqual(failures, [], "\n".join(f"{name}: {message}" for name, message in failures))
+    
+    def test_missing_font_fails(self):
+        """Test that the comparison fails, rather than skips, without the golden font."""
+        missing = os.path.join(os.path.dirname(golden.GOLDEN_FONT), "missing.ttf")
+        with mock.patch.object(golden, "GOLDEN_FONT", missing):
+            with self.assertRaises(FileNotFoundError):
+                golden.check_goldens()
+    
+    def test_other_font_fails(self):
+        """Test that references rendered with another font are reported, not compared."""
+        index = golden.load_index()
+        index["fonts"]["font"] = "0" * 64
+        with mock.patch.object(golden, "load_index", return_value=index):
+            failures = golden.check_goldens()
+        self.assertEqual(len(failures), 1)
+        self.assertIn("another font", failures[0][1])
+    
+    def test_comparison_tolerance(self):
+        """Test that slight noise passes while a missing highlight, a neighbouring kana or a colour change fails."""
+        size = golden.GOLDEN_SIZE
+        with golden.golden_fonts():
+            expected = generate_wallpaper(HIRAGANA_DATA[1], highlight=True, size=size)
+            no_highlight = generate_wallpaper(HIRAGANA_DATA[1], size=size)
+            neighbour = generate_wallpaper(HIRAGANA_DATA[2], highlight=True, size=size)
+        
+        noisy = expected.copy()
+        rng = random.Random(0)
+        for _ in range(200):
+            xy = (rng.randrange(size[0]), rng.randrange(size[1]))
+            noisy.putpixel(xy, tuple(min(255, level + 3) for level in noisy.getpixel(xy)))
+        changed, _, mean = golden.compare_images(expected, noisy)
+        self.assertLessEqual(changed, golden.MAX_CHANGED_PIXELS)
+        self.assertLessEqual(mean, golden.MAX_MEAN_DIFFERENCE)
+        
+        self.assertGreater(golden.compare_images(expected, no_highlight)[0], golden.MAX_CHANGED_PIXELS)
+        self.assertGreater(golden.compare_images(expected, neighbour)[0], golden.MAX_CHANGED_PIXELS)
+        
+        tinted = ImageChops.add(expected, Image.new("RGB", size, (0, 0, 8)))
+        self.assertGreater(golden.compare_images(expected, tinted)[2], golden.MAX_MEAN_DIFFERENCE)
+    
+    def test_save_diff(self):
+        """Test that a failure writes expected, actual and difference side by side."""
+        size = golden.GOLDEN_SIZE
+        expected = generate_wallpaper(HIRAGANA_DATA[1], size=size)
+        actual = generate_wallpaper(HIRAGANA_DATA[2], size=size)
+        path = golden.save_diff("test_save_diff", expected, actual)
+        with Image.open(path) as sheet:
+            self.assertEqual(sheet.size, (size[0] * 3, size[1]))
+            self.assertIsNone(ImageChops.difference(sheet.crop((0, 0, *size)), expected).getbbox())
+        os.remove(path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+"""
+Tests that importing the package and the CLI's quick paths stay light.
+"""
+
+import unittest
+import os
+import subprocess
+import sys
+import tempfile
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+# Modules that only rendering should load
+HEAVY_MODULES = ("PIL", "numpy", "concurrent.futures.process")
+
+def loaded_heavy_modules(code, cwd=None):
+    """Run code in a fresh interpreter and return the heavy modules it loaded."""
+    script = (f"import sys; sys.path.insert(0, {SRC_DIR!r})\n{code}\n"
+              f"print('HEAVY=' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", script], cwd=cwd, capture_output=True, text=True, check=True)
+    heavy = result.stdout.rsplit("HEAVY=", 1)[1].strip()
+    return [name for name in heavy.split(",") if name]
+
+class TestImports(unittest.TestCase):
+    """Test cases for lazy imports."""
+
+    def test_package_import_is_lazy(self):
+        """Test that importing the package loads neither Pillow nor the decks."""
+        code = "import hiragana_wallpaper\nassert 'hiragana_wallpaper.deck' not in sys.modules\nimport hiragana_wallpaper.cli"
+        self.assertEqual(loaded_heavy_modules(code), [])
+
+    def test_lazy_attributes(self):
+        """Test that the public names still resolve on first access."""
+        code = ("import hiragana_wallpaper as hw\n"
+                "assert len(hw.HIRAGANA_DATA) == 71 and hw.COLORS['background']\n"
+                "assert 'generate_wallpaper' in dir(hw)")
+        self.assertEqual(loaded_heavy_modules(code), [])
+
+    def test_quick_commands_do_not_load_pillow(self):
+        """Test that --list-decks and an up-to-date rebuild render nothing and skip Pillow."""
+        with tempfile.TemporaryDirectory() as tmp:
+            run = "from hiragana_wallpaper.cli import main\nmain({argv!r})"
+            self.assertEqual(loaded_heavy_modules(run.format(argv=["--list-decks"]), tmp), [])
+
+            argv = ["--deck", "yoon", "--sizes", "160x100"]
+            self.assertIn("PIL", loaded_heavy_modules(run.format(argv=argv), tmp))
+            self.assertEqual(loaded_heavy_modules(run.format(argv=argv), tmp), [])
+
+if __name__ == '__main__':
+    unittest.main()
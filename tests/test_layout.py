@@ -0,0 +1,62 @@
+"""
+Tests for the resolution-independent layout.
+"""
+
+import unittest
+import os
+import sys
+
+# Add the src directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from hiragana_wallpaper import HIRAGANA_DATA, generate_wallpaper
+from hiragana_wallpaper.layout import BASE_LAYOUT, BASE_SIZE, LAYOUT_CACHE_SIZE, get_layout, parse_size
+
+class TestLayout(unittest.TestCase):
+    """Test cases for layout scaling and size parsing."""
+    
+    def test_base_size_uses_design_values(self):
+        """Test that the 2880x1800 layout is the original design."""
+        layout = get_layout(*BASE_SIZE)
+        self.assertEqual(layout["scale"], 1)
+        for key, value in BASE_LAYOUT.items():
+            self.assertEqual(layout[key], value)
+        self.assertEqual(layout["hero_box"], (0, 0, 1440, 1800))
+        self.assertEqual((layout["chart_x"], layout["chart_y"], layout["chart_width"]), (1460, 150, 1400))
+    
+    def test_layout_scales_with_size(self):
+        """Test that a smaller display gets proportionally smaller text."""
+        layout = get_layout(1920, 1080)
+        self.assertEqual(layout["scale"], 0.6)
+        self.assertEqual(layout["hero_font_size"], 156)
+        self.assertEqual(layout["row_height"], 33)
+    
+    def test_portrait_stacks_character_above_chart(self):
+        """Test that portrait images put the chart below the character."""
+        layout = get_layout(1080, 1920)
+        self.assertEqual(layout["hero_box"], (0, 0, 1080, 960))
+        self.assertEqual(layout["chart_y"], 960)
+        self.assertGreater(layout["chart_width"], 0)
+    
+    def test_layout_cache_is_bounded(self):
+        """Test that many distinct sizes don't grow the layout cache without limit."""
+        for width in range(100, 100 + 3 * LAYOUT_CACHE_SIZE):
+            get_layout(width, 100)
+        self.assertLessEqual(get_layout.cache_info().currsize, LAYOUT_CACHE_SIZE)
+    
+    def test_parse_size(self):
+        """Test explicit sizes, presets and invalid input."""
+        self.assertEqual(parse_size("1920x1080"), (1920, 1080))
+        self.assertEqual(parse_size("4K"), (3840, 2160))
+        for text in ("1920", "axb", "0x100"):
+            with self.assertRaises(ValueError):
+                parse_size(text)
+    
+    def test_generate_at_other_sizes(self):
+        """Test that wallpapers are rendered at the requested size."""
+        for size in [(1920, 1080), (1080, 1920)]:
+            wallpaper = generate_wallpaper(HIRAGANA_DATA[0], size=size)
+            self.assertEqual(wallpaper.size, size)
+
+if __name__ == '__main__':
+    unittest.main()
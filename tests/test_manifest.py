@@ -0,0 +1,79 @@
+"""
+Tests for the incremental build manifest.
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+
+# Add the src directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from hiragana_wallpaper import HIRAGANA_DATA
+from hiragana_wallpaper.manifest import (
+    render_key, plan_build, prune_files, save_manifest, load_manifest
+)
+
+class TestManifest(unittest.TestCase):
+    """Test cases for content-hash based incremental builds."""
+    
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.output_dir = self._tmp.name
+    
+    def tearDown(self):
+        self._tmp.cleanup()
+    
+    def _touch(self, filename):
+        with open(os.path.join(self.output_dir, filename), "wb"):
+            pass
+    
+    def test_render_key_tracks_inputs(self):
+        """Test that the key changes with the entry and the render settings."""
+        first, second = HIRAGANA_DATA[0], HIRAGANA_DATA[1]
+        self.assertEqual(render_key(first, size=[2880, 1800]), render_key(first, size=[2880, 1800]))
+        self.assertNotEqual(render_key(first, size=[2880, 1800]), render_key(second, size=[2880, 1800]))
+        self.assertNotEqual(render_key(first, size=[2880, 1800]), render_key(first, size=[1920, 1080]))
+    
+    def test_unchanged_files_are_skipped(self):
+        """Test that only new or changed files are planned for rendering."""
+        wanted = {"a.png": "key-a", "b.png": "key-b"}
+        self._touch("a.png")
+        self._touch("b.png")
+        save_manifest(self.output_dir, {"a.png": "key-a", "b.png": "old-key"})
+        
+        to_render, to_prune = plan_build(self.output_dir, wanted)
+        self.assertEqual(to_render, ["b.png"])
+        self.assertEqual(to_prune, [])
+        
+        to_render, _ = plan_build(self.output_dir, wanted, force=True)
+        self.assertEqual(sorted(to_render), ["a.png", "b.png"])
+    
+    def test_missing_files_are_rendered(self):
+        """Test that a file listed in the manifest but deleted is re-rendered."""
+        save_manifest(self.output_dir, {"a.png": "key-a"})
+        to_render, _ = plan_build(self.output_dir, {"a.png": "key-a"})
+        self.assertEqual(to_render, ["a.png"])
+    
+    def test_removed_entries_are_pruned(self):
+        """Test that files for removed entries are deleted."""
+        self._touch("a.png")
+        self._touch("gone.png")
+        save_manifest(self.output_dir, {"a.png": "key-a", "gone.png": "key-gone"})
+        
+        _, to_prune = plan_build(self.output_dir, {"a.png": "key-a"})
+        self.assertEqual(to_prune, ["gone.png"])
+        
+        prune_files(self.output_dir, to_prune + ["../outside.png"])
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, "gone.png")))
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, "a.png")))
+    
+    def test_unreadable_manifest_means_full_build(self):
+        """Test that a corrupt manifest is treated as empty."""
+        with open(os.path.join(self.output_dir, ".hiragana-manifest.json"), "w") as f:
+            f.write("{not json")
+        self.assertEqual(load_manifest(self.output_dir), {})
+
+if __name__ == '__main__':
+    unittest.main()
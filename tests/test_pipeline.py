@@ -0,0 +1,69 @@
+"""
+Tests for the streaming generation API.
+"""
+
+import unittest
+import io
+import os
+import sys
+import tempfile
+
+# Add the src directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from PIL import Image
+from hiragana_wallpaper import HIRAGANA_DATA, iter_wallpapers, generate_all
+
+SIZE = (480, 300)
+
+class TestPipeline(unittest.TestCase):
+    """Test cases for iter_wallpapers and generate_all."""
+    
+    def _counting(self, entries):
+        """Wrap entries so the test can see how many were requested."""
+        self.pulled = 0
+        for entry in entries:
+            self.pulled += 1
+            yield entry
+    
+    def test_iter_wallpapers_is_lazy(self):
+        """Test that entries are only rendered as they are consumed."""
+        wallpapers = iter_wallpapers(self._counting(HIRAGANA_DATA), size=SIZE)
+        entry, image = next(wallpapers)
+        self.assertEqual(entry, HIRAGANA_DATA[0])
+        self.assertEqual(image.size, SIZE)
+        self.assertEqual(self.pulled, 1)
+        wallpapers.close()
+    
+    def test_worker_pool_keeps_order_and_bounded_lookahead(self):
+        """Test that parallel rendering yields in order with limited look-ahead."""
+        entries = HIRAGANA_DATA[:6]
+        wallpapers = iter_wallpapers(self._counting(entries), size=SIZE, fmt="png",
+                                     jobs=2, lookahead=2)
+        first_entry, data = next(wallpapers)
+        self.assertEqual(first_entry, entries[0])
+        self.assertLessEqual(self.pulled, 3)
+        with Image.open(io.BytesIO(data)) as decoded:
+            self.assertEqual(decoded.size, SIZE)
+        
+        rest = [entry for entry, _ in wallpapers]
+        self.assertEqual(rest, entries[1:])
+    
+    def test_parallel_matches_serial(self):
+        """Test that worker processes produce the same bytes as rendering in-process."""
+        entries = HIRAGANA_DATA[:3]
+        serial = [data for _, data in iter_wallpapers(entries, size=SIZE, fmt="png")]
+        parallel = [data for _, data in iter_wallpapers(entries, size=SIZE, fmt="png", jobs=2)]
+        self.assertEqual(serial, parallel)
+    
+    def test_generate_all_writes_files(self):
+        """Test that generate_all writes one file per entry."""
+        with tempfile.TemporaryDirectory() as output_dir:
+            results = generate_all(output_dir, HIRAGANA_DATA[:2], size=SIZE, fmt="webp")
+            self.assertEqual(len(results), 2)
+            for result in results:
+                self.assertTrue(result.path.endswith(".webp"))
+                self.assertEqual(os.path.getsize(result.path), result.bytes)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Tests for the per-stage timing hooks.
+"""
+
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+# Add the src directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from hiragana_wallpaper import HIRAGANA_DATA, generate_wallpaper, generate_all
+from hiragana_wallpaper import profiling
+
+SIZE = (480, 300)
+
+class TestProfiling(unittest.TestCase):
+    """Test cases for stage hooks and the stage recorder."""
+    
+    def setUp(self):
+        self.recorder = profiling.StageRecorder()
+        profiling.add_hook(self.recorder)
+    
+    def tearDown(self):
+        profiling.clear_hooks()
+    
+    def test_generate_wallpaper_reports_stages(self):
+        """Test that rendering reports each stage to the hooks."""
+        with profiling.image("test"):
+            generate_wallpaper(HIRAGANA_DATA[0], highlight=True, size=SIZE)
+        
+        stages = [event["stage"] for event in self.recorder.events]
+        self.assertEqual(stages, ["background", "fonts", "hero", "highlight"])
+        for event in self.recorder.events:
+            self.assertEqual(event["image"], "test")
+            self.assertGreaterEqual(event["seconds"], 0)
+    
+    def test_no_hooks_no_events(self):
+        """Test that nothing is recorded once the hook is removed."""
+        profiling.remove_hook(self.recorder)
+        generate_wallpaper(HIRAGANA_DATA[0], size=SIZE)
+        self.assertEqual(self.recorder.events, [])
+    
+    def test_worker_events_and_bytes(self):
+        """Test that stages timed in worker processes reach the parent's hooks."""
+        with tempfile.TemporaryDirectory() as output_dir:
+            results = generate_all(output_dir, HIRAGANA_DATA[:2], size=SIZE, jobs=2)
+            
+            images = self.recorder.per_image()
+            self.assertEqual(len(images), 2)
+            for result, record in zip(results, images.values()):
+                self.assertEqual(record["bytes"], result.bytes)
+                self.assertIn("encode", record["stages"])
+                self.assertIn("hero", record["stages"])
+            
+            summary = self.recorder.summary()
+            self.assertEqual(summary["write"]["count"], 2)
+            self.assertIn("encode", self.recorder.format_table())
+            
+            trace_path = os.path.join(output_dir, "trace.json")
+            self.recorder.save_trace(trace_path)
+            with open(trace_path, encoding="utf-8") as f:
+                trace = json.load(f)
+            self.assertEqual(len(trace["traceEvents"]), len(self.recorder.events))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+Tests for the wallpaper rotation daemon.
+"""
+
+import unittest
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add the src directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from hiragana_wallpaper import HIRAGANA_DATA
+from hiragana_wallpaper.rotate import (Rotator, SymlinkSetter, FileSetter,
+                                       sequential_order, random_order, spaced_order)
+
+SIZE = (320, 200)
+
+def chars(order, count):
+    return [entry["char"] for entry in itertools.islice(order, count)]
+
+class TestOrders(unittest.TestCase):
+    """Test cases for the rotation orders."""
+    
+    def test_sequential_wraps_around(self):
+        """Test that the sequential order starts over after the last entry."""
+        entries = HIRAGANA_DATA[:3]
+        self.assertEqual(chars(sequential_order(entries), 5), list("あいうあい"))
+    
+    def test_random_shows_every_entry_once_per_pass(self):
+        """Test that each pass of the random order is a permutation of the deck."""
+        entries = HIRAGANA_DATA[:10]
+        shown = chars(random_order(entries, random.Random(1)), 30)
+        for start in range(0, 30, 10):
+            self.assertEqual(sorted(shown[start:start + 10]), sorted(entry["char"] for entry in entries))
+        self.assertTrue(all(a != b for a, b in zip(shown, shown[1:])))
+    
+    def test_spaced_repeats_new_kana_sooner(self):
+        """Test that kana are introduced in order and come back at growing intervals."""
+        shown = chars(spaced_order(HIRAGANA_DATA, random.Random(0)), 200)
+        self.assertEqual(shown[:4], list("あいあい"))
+        self.assertEqual([char for char in dict.fromkeys(shown)][:5], list("あいうえお"))
+        positions = [index for index, char in enumerate(shown) if char == "あ"]
+        gaps = [b - a for a, b in zip(positions, positions[1:])]
+        self.assertEqual(gaps[:3], sorted(gaps[:3]))
+        self.assertGreater(gaps[2], gaps[0])
+    
+    def test_spaced_introduces_whole_deck(self):
+        """Test that every kana of the full deck is shown within a bounded number of wallpapers."""
+        self.assertEqual(len(HIRAGANA_DATA), 71)
+        for seed in range(3):
+            shown = set(chars(spaced_order(HIRAGANA_DATA, random.Random(seed)), 10 * len(HIRAGANA_DATA)))
+            self.assertEqual(shown, {entry["char"] for entry in HIRAGANA_DATA})
+
+class TestRotator(unittest.TestCase):
+    """Test cases for rendering ahead and swapping wallpapers."""
+    
+    def _wait_for(self, condition, timeout=30):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            self.assertLess(time.monotonic(), deadline, "timed out")
+            time.sleep(0.01)
+    
+    def test_renders_ahead_and_swaps_symlink(self):
+        """Test that switches apply pre-rendered files and only ahead files are kept waiting."""
+        with tempfile.TemporaryDirectory() as tmp:
+            spool_dir = os.path.join(tmp, "spool")
+            target = os.path.join(tmp, "current.png")
+            order = sequential_order(HIRAGANA_DATA[:4])
+            with Rotator(order, SymlinkSetter(target), spool_dir, size=SIZE, ahead=2) as rotator:
+                self._wait_for(lambda: rotator.pending() == 2)
+                time.sleep(0.1)
+                self.assertEqual(rotator.pending(), 2)
+                
+                self.assertEqual(rotator.switch()["char"], "あ")
+                first = os.readlink(target)
+                self.assertIn("hiragana_a_あ", first)
+                
+                self.assertEqual(rotator.switch()["char"], "い")
+                self.assertIn("hiragana_i_い", os.readlink(target))
+                self.assertFalse(os.path.exists(first))
+                self._wait_for(lambda: rotator.pending() == 2)
+            
+            # Only the wallpaper on screen is left
+            self.assertEqual(os.listdir(spool_dir), [os.path.basename(os.readlink(target))])
+    
+    def test_run_with_file_setter(self):
+        """Test a short run that renames each wallpaper onto a fixed path."""
+        with tempfile.TemporaryDirectory() as tmp:
+            target = os.path.join(tmp, "wallpaper.png")
+            shown = []
+            with Rotator(sequential_order(HIRAGANA_DATA), FileSetter(target), tmp, size=SIZE) as rotator:
+                rotator.run(0.01, count=3, on_switch=lambda entry: shown.append(entry["char"]))
+            self.assertEqual(shown, list("あいう"))
+            self.assertEqual(os.listdir(tmp), ["wallpaper.png"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+Tests for the on-demand wallpaper HTTP server.
+"""
+
+import unittest
+import io
+import json
+import os
+import sys
+import threading
+import urllib.error
+import urllib.request
+from unittest import mock
+
+# Add the src directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from PIL import Image
+from hiragana_wallpaper.server import ImageCache, WallpaperServer, find_entry
+from hiragana_wallpaper.themes import THEMES
+
+class TestImageCache(unittest.TestCase):
+    """Test cases for the byte-bounded LRU."""
+    
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest unused entry goes first when over budget."""
+        cache = ImageCache(max_bytes=10)
+        cache.put("a", b"1234")
+        cache.put("b", b"1234")
+        cache.get("a")
+        cache.put("c", b"1234")
+        
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), b"1234")
+        self.assertEqual(cache.total_bytes, 8)
+    
+    def test_find_entry_by_kana_or_romaji(self):
+        """Test looking up characters by kana and by romaji."""
+        self.assertEqual(find_entry("ka")["char"], "か")
+        self.assertEqual(find_entry("ぢ")["pronunciation"], "ji")
+        self.assertIsNone(find_entry("xyz"))
+
+class TestWallpaperServer(unittest.TestCase):
+    """Test cases for serving wallpapers over HTTP."""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.server = WallpaperServer(("127.0.0.1", 0), jobs=2, sizes=[(320, 200), (640, 400)])
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+    
+    def _get(self, path, headers=None):
+        request = urllib.request.Request(self.base_url + path, headers=headers or {})
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                return response.status, dict(response.headers), response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, dict(e.headers), e.read()
+    
+    def test_serves_requested_size_and_format(self):
+        """Test that a wallpaper is rendered at the requested size and format."""
+        status, headers, body = self._get("/wallpaper/ka?w=640&h=400&fmt=webp")
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["Content-Type"], "image/webp")
+        with Image.open(io.BytesIO(body)) as image:
+            self.assertEqual(image.size, (640, 400))
+    
+    def test_etag_revalidation_and_cache(self):
+        """Test that If-None-Match gets a 304 and repeats come from the cache."""
+        status, headers, body = self._get("/wallpaper/a?w=320&h=200")
+        self.assertEqual(status, 200)
+        etag = headers["ETag"]
+        
+        status, _, body_again = self._get("/wallpaper/a?w=320&h=200")
+        self.assertEqual(body_again, body)
+        self.assertGreaterEqual(self.server.cache.hits, 1)
+        
+        status, _, empty = self._get("/wallpaper/a?w=320&h=200", {"If-None-Match": etag})
+        self.assertEqual(status, 304)
+        self.assertEqual(empty, b"")
+        for header in (f'"other", W/{etag}', "*"):
+            self.assertEqual(self._get("/wallpaper/a?w=320&h=200", {"If-None-Match": header})[0], 304)
+        self.assertEqual(self._get("/wallpaper/a?w=320&h=200", {"If-None-Match": '"other"'})[0], 200)
+        
+        # Changing the theme's settings changes the ETag
+        with mock.patch.dict(THEMES["plain"], {"background": "#000000"}):
+            status, headers, _ = self._get("/wallpaper/a?w=320&h=200", {"If-None-Match": etag})
+        self.assertEqual(status, 200)
+        self.assertNotEqual(headers["ETag"], etag)
+    
+    def test_errors(self):
+        """Test unknown characters and invalid parameters."""
+        self.assertEqual(self._get("/wallpaper/xyz")[0], 404)
+        self.assertEqual(self._get("/wallpaper/ka?w=0")[0], 400)
+        self.assertEqual(self._get("/wallpaper/ka?w=8192&h=8192")[0], 400)
+        self.assertEqual(self._get("/wallpaper/ka?w=640&h=200")[0], 400)
+        self.assertEqual(self._get("/wallpaper/ka?fmt=gif")[0], 400)
+        self.assertEqual(self._get("/nothing")[0], 404)
+    
+    def test_default_size_is_first_served_size(self):
+        """Test that a request without w and h gets the first served size."""
+        status, _, body = self._get("/wallpaper/ka")
+        self.assertEqual(status, 200)
+        with Image.open(io.BytesIO(body)) as image:
+            self.assertEqual(image.size, (320, 200))
+    
+    def test_index_lists_characters(self):
+        """Test that / lists the available characters."""
+        status, _, body = self._get("/")
+        self.assertEqual(status, 200)
+        self.assertIn("ka", [entry["pronunciation"] for entry in json.loads(body)])
+
+if __name__ == '__main__':
+    unittest.main()
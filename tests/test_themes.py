@@ -0,0 +1,70 @@
+"""
+Tests for colour themes and background compositing.
+"""
+
+import unittest
+import os
+import sys
+
+# Add the src directory to the path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from hiragana_wallpaper import HIRAGANA_DATA, COLORS, generate_wallpaper
+from hiragana_wallpaper.generator import get_background
+from hiragana_wallpaper.deck import get_deck
+from hiragana_wallpaper.themes import THEMES, available_themes, get_theme, needs_compositing
+
+SIZE = (480, 300)
+
+class TestThemes(unittest.TestCase):
+    """Test cases for theme settings."""
+
+    def test_plain_theme_is_the_original_colors(self):
+        """Test that the default theme needs no compositing and matches COLORS."""
+        self.assertEqual(get_theme("plain"), COLORS)
+        self.assertFalse(needs_compositing(get_theme("plain")))
+        self.assertIn("plain", available_themes())
+        with self.assertRaises(ValueError):
+            get_theme("nope")
+
+    def test_accent_groups_follow_chart_data(self):
+        """Test that voiced kana share their base column's group, and each group has an accent."""
+        groups = {record.char: record.group for record in get_deck()}
+        self.assertEqual(groups["か"], groups["が"])
+        self.assertEqual(groups["は"], groups["ぱ"])
+        self.assertEqual(groups["し"], groups["さ"])
+        self.assertNotEqual(groups["か"], groups["さ"])
+        self.assertNotEqual(groups["な"], groups["ん"])
+        self.assertEqual(len(set(groups.values())), len(THEMES["groups"]["accents"]))
+
+@unittest.skipUnless(len(available_themes()) > 1, "themes need numpy")
+class TestCompositing(unittest.TestCase):
+    """Test cases for the NumPy-composited backgrounds."""
+
+    def test_themed_backgrounds_are_cached(self):
+        """Test that a theme's background is composited once per size."""
+        for theme in THEMES:
+            self.assertIs(get_background(SIZE, theme=theme), get_background(SIZE, theme=theme))
+
+    def test_gradient_and_vignette(self):
+        """Test that the dusk theme gets lighter towards the bottom and darker at the corners."""
+        background = get_background(SIZE, theme="dusk")
+        width, height = SIZE
+        top = background.getpixel((width // 4, 2))
+        bottom = background.getpixel((width // 4, height // 2 + 100))
+        corner = background.getpixel((width - 1, height - 1))
+        self.assertGreater(sum(bottom), sum(top))
+        self.assertLess(sum(corner), sum(bottom))
+
+    def test_themed_wallpapers(self):
+        """Test that every theme renders a full-size wallpaper with the highlight."""
+        plain = generate_wallpaper(HIRAGANA_DATA[5], size=SIZE)
+        for theme in THEMES:
+            wallpaper = generate_wallpaper(HIRAGANA_DATA[5], highlight=True, size=SIZE, theme=theme)
+            self.assertEqual(wallpaper.size, SIZE)
+            self.assertEqual(wallpaper.mode, "RGB")
+            if theme != "plain":
+                self.assertNotEqual(wallpaper.tobytes(), plain.tobytes())
+
+if __name__ == '__main__':
+    unittest.main()